@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import auth, companies, users, collab_cards, cards
+from .endpoints import auth, companies, users, collab_cards, cards, uploads
 router = APIRouter()
 
 router.include_router(auth.router)
@@ -7,6 +7,7 @@ router.include_router(companies.router)
 router.include_router(users.router)
 router.include_router(collab_cards.router)
 router.include_router(cards.router)
+router.include_router(uploads.router)
 
 @router.get("/health", tags=["health"])
 def health():
@@ -1,31 +1,81 @@
-from fastapi import Depends, HTTPException, status
+from typing import Callable
+
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
+from app.api.user_cache import user_cache
 from app.core.database import get_db
-from app.services.security import decode_access_token
+from app.services.security import decode_access_token, decode_scoped_token
 from app.models.user import User, Role
 from sqlalchemy import select
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=False)
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+async def _user_for_token(token: str, db: AsyncSession) -> User:
     try:
         email = decode_access_token(token)
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return await _user_for_email(email, db)
 
+
+async def _user_for_email(email: str, db: AsyncSession) -> User:
+    user = await user_cache.get(email)
+    if user is not None:
+        return user
+
+    generation = await user_cache.generation(email)  # before the read, see user_cache
     res = await db.execute(select(User).where(User.email == email))
     user = res.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    await user_cache.put(email, user, generation)
     return user
 
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    return await _user_for_token(token, db)
+
+
+def get_current_user_or_scoped_token(scope: Callable[[Request], str]):
+    """
+    ``get_current_user`` that, without an Authorization header, takes
+    ``?access_token=``: a scoped token (``create_scoped_token``) for
+    ``scope(request)``. Session tokens are only accepted in the header, so
+    they never end up in URLs, logs or browser history.
+    """
+
+    async def dependency(
+        request: Request,
+        token: str | None = Depends(oauth2_scheme_optional),
+        access_token: str | None = Query(
+            None, description="Scoped token, for <img>, links and EventSource"
+        ),
+        db: AsyncSession = Depends(get_db),
+    ) -> User:
+        if token:
+            return await _user_for_token(token, db)
+        if not access_token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        try:
+            email = decode_scoped_token(access_token, scope(request))
+        except JWTError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        return await _user_for_email(email, db)
+
+    return dependency
+
+
 def require_global_owner(user: User = Depends(get_current_user)) -> User:
     if user.role != Role.owner:
         raise HTTPException(status_code=403, detail="Not enough privileges")
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import datetime as dt
+import logging
 import uuid
-from pathlib import Path
-from typing import List
+import zipfile
+import zlib
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterable, List
 
 from fastapi import (
     APIRouter,
@@ -12,29 +15,59 @@ from fastapi import (
     File,
     HTTPException,
     Query,
+    Request,
     UploadFile,
     status,
 )
-from sqlalchemy import select, update
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user, get_db
+from app.api.dependencies import get_current_user, get_current_user_or_scoped_token, get_db
+from app.api.files import file_response
+from app.api.ranges import byte_range
+from app.api.spool import copy_to, run_io, run_io_many
+from app.core.card_files import THUMB_SUFFIX, card_version, thumb_name, thumb_path
 from app.core.config import get_settings
 from app.models import AuditLog, Batch, CollabCard, User
-from app.models.enums import BatchStatus, RecordStatus
+from app.models.enums import RecordStatus
 from app.models.user import Role
 from app.schemas.batch import BatchRead
+from app.schemas.token import ScopedToken
+from app.services.card_store import (
+    CARDS_ROOT,
+    StoredCard,
+    attach_cards,
+    card_dest_dir,
+    existing_ids,
+    store_card,
+    temp_path,
+)
+from app.services.events import publish_batch
+from app.services.security import card_scope, create_scoped_token
+from app.services.tasks import make_thumbnails, optimize_cards, render_batch
+from app.services.zipstream import StoredZip, ZipMember
 
 # ──────────────────────────────────────────────────────────────
 # Router / constants
 # ──────────────────────────────────────────────────────────────
 router = APIRouter(prefix="/cards", tags=["cards"])
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+THUMB_TASK_CHUNK = 500  # cards per make_thumbnails / optimize_cards task
 
-CARDS_ROOT = Path(settings.upload_dir or "/data/uploads").joinpath("cards")
-CARDS_ROOT.mkdir(parents=True, exist_ok=True)
+# ZIP uploads: limits checked against the central directory before extracting
+ZIP_MAX_MEMBERS = 100_000
+ZIP_MAX_MEMBER_BYTES = 32 * 1_048_576      # one card
+ZIP_MAX_TOTAL_BYTES = 8 * 1024 ** 3        # whole archive, uncompressed
+ZIP_MAX_RATIO = 100                        # uncompressed / compressed, per member…
+ZIP_RATIO_MIN_BYTES = 1_048_576            # …once it is big enough to matter
 
-CHUNK = 1_048_576  # 1 MiB
+# card images: a URL whose ?v= matches the card's content never changes
+CACHE_IMMUTABLE = "private, max-age=31536000, immutable"
+CACHE_REVALIDATE = "private, no-cache"
 
 
 # ──────────────────────────────────────────────────────────────
@@ -48,6 +81,35 @@ def _company_guard(current: User, batch: Batch) -> None:
         raise HTTPException(status_code=403, detail="Cannot act on other companies")
 
 
+def _queue_thumbnails(card_files: Iterable[Path]) -> None:
+    """
+    Drop the previews of replaced cards and have the worker make new ones.
+    Runs before the records are committed, so a fresh ``thumbnail_url``
+    never serves (and lets a browser cache) the old preview.
+    """
+    rels = []
+    for path in card_files:
+        thumb_path(path).unlink(missing_ok=True)
+        rels.append(str(path.relative_to(CARDS_ROOT)))
+    if not rels:
+        return
+    try:
+        for start in range(0, len(rels), THUMB_TASK_CHUNK):
+            make_thumbnails.delay(rels[start : start + THUMB_TASK_CHUNK])
+    except Exception:  # noqa: BLE001 – previews are optional, the cards are saved
+        logger.warning("could not queue thumbnails for %d cards", len(rels), exc_info=True)
+
+
+def _queue_optimize(batch: Batch, rec_ids: Iterable[uuid.UUID]) -> None:
+    """Have the worker recompress newly attached cards; runs after the commit."""
+    ids = [str(rec_id) for rec_id in rec_ids]
+    try:
+        for start in range(0, len(ids), THUMB_TASK_CHUNK):
+            optimize_cards.delay(str(batch.id), ids[start : start + THUMB_TASK_CHUNK])
+    except Exception:  # noqa: BLE001 – the cards are saved, just not optimized yet
+        logger.warning("could not queue optimization for %d cards", len(ids), exc_info=True)
+
+
 async def _log(
     db: AsyncSession,
     *,
@@ -69,6 +131,31 @@ async def _log(
     await db.commit()
 
 
+def _save_card(src: BinaryIO, dest_path: Path) -> StoredCard:
+    """
+    Blocking: write one uploaded card and store it (see ``store_card``). The
+    card path may be a link to a blob shared with other records, so it is
+    only ever replaced, never written in place.
+    """
+    tmp = temp_path(dest_path)
+    try:
+        spooled = copy_to(src, tmp)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return store_card(tmp, dest_path, spooled.digest.hexdigest())
+
+
+def _record_id(filename: str) -> uuid.UUID | None:
+    """record id from a ``<uuid>.png`` file name, None if it isn't one."""
+    if not filename.lower().endswith(".png"):
+        return None
+    try:
+        return uuid.UUID(filename.rsplit(".", 1)[0])
+    except ValueError:
+        return None
+
+
 # ──────────────────────────────────────────────────────────────
 # 1. Upload one or many PNG e-cards for a single batch
 # ──────────────────────────────────────────────────────────────
@@ -98,69 +185,156 @@ async def upload_cards(
     if company_id and company_id != batch.company_id:
         raise HTTPException(400, detail="company_id does not match batch")
 
-    # dest = /data/uploads/cards/<company|global>/<batch>/
-    dest_dir = (
-        CARDS_ROOT
-        / (str(batch.company_id) if batch.company_id else "global")
-        / str(batch.id)
+    dest_dir = card_dest_dir(batch)
+
+    # record ids come from the file names (not <uuid>.png → ignored), so only
+    # the records actually being uploaded are looked up, not the whole batch;
+    # a record named twice keeps its last file
+    named = {rec_id: f for f in files if (rec_id := _record_id(f.filename))}
+    existing = await existing_ids(db, batch, list(named))
+    named = {rec_id: f for rec_id, f in named.items() if rec_id in existing}
+
+    # stream-save, hashing on the way, several files at once
+    stored = await run_io_many(
+        partial(_save_card, f.file, dest_dir / f.filename) for f in named.values()
     )
-    dest_dir.mkdir(parents=True, exist_ok=True)
+    saved: dict[uuid.UUID, StoredCard] = dict(zip(named, stored))
 
-    now = dt.datetime.utcnow()
-    saved = 0
+    # ── records + batch counters / status, one transaction ────
+    _queue_thumbnails(card.path for card in saved.values())
+    await attach_cards(db, batch, saved)
+    await db.commit()
+    await db.refresh(batch)
+    await publish_batch(db, batch.id)
+    _queue_optimize(batch, saved)
 
-    # build a map of cp;p;.id → record
-    records_by_id: dict[uuid.UUID, CollabCard] = {
-        r.id: r
-        for r in (
-            await db.execute(
-                select(CollabCard).where(CollabCard.batch_id == batch.id)
-            )
-        ).scalars()
-    }
+    # ── audit entry async ─────────────────────────────────────
+    background_tasks.add_task(
+        _log,
+        db=db,
+        user_id=current.id,
+        entity_type="batch",
+        entity_id=batch.id,
+        action="upload_cards",
+        details={"files": len(saved)},
+    )
+
+    return batch
+
+
+# ──────────────────────────────────────────────────────────────
+# 1B. Upload a ZIP of PNG e-cards for a single batch
+# ──────────────────────────────────────────────────────────────
+def _scan_zip(zf: zipfile.ZipFile) -> dict[uuid.UUID, zipfile.ZipInfo]:
+    """
+    Vet an archive from its central directory alone and return its
+    ``<uuid>.png`` members by record id (any folder; last one wins).
+
+    Raises ValueError for anything that looks like a zip bomb (too many
+    members, oversized or over-compressed members, too much data in total),
+    for encrypted members and for unsafe names (absolute, ``..``, drive
+    letters), even though members are only ever written under their id.
+    """
+    infos = zf.infolist()
+    if len(infos) > ZIP_MAX_MEMBERS:
+        raise ValueError(f"more than {ZIP_MAX_MEMBERS} entries")
 
-    for f in files:
-        if not f.filename.lower().endswith(".png"):
-            continue  # silently skip non-png
+    members: dict[uuid.UUID, zipfile.ZipInfo] = {}
+    total = 0
+    for info in infos:
+        path = PurePosixPath(info.filename.replace("\\", "/"))
+        if path.is_absolute() or ".." in path.parts or ":" in info.filename:
+            raise ValueError(f"unsafe entry name {info.filename!r}")
+        if info.is_dir():
+            continue
+        if info.flag_bits & 0x1:
+            raise ValueError(f"{info.filename!r} is encrypted")
+        if info.file_size > ZIP_MAX_MEMBER_BYTES:
+            raise ValueError(f"{info.filename!r} is larger than {ZIP_MAX_MEMBER_BYTES} bytes")
+        if (
+            info.file_size > ZIP_RATIO_MIN_BYTES
+            and info.file_size > ZIP_MAX_RATIO * info.compress_size
+        ):
+            raise ValueError(f"{info.filename!r} is compressed more than {ZIP_MAX_RATIO}:1")
+        total += info.file_size
+        if total > ZIP_MAX_TOTAL_BYTES:
+            raise ValueError(f"more than {ZIP_MAX_TOTAL_BYTES} bytes uncompressed")
 
-        # try to parse record_id from file stem (e.g. <uuid>.png)
+        rec_id = _record_id(path.name)
+        if rec_id is not None:
+            members[rec_id] = info
+    return members
+
+
+def _extract_cards(
+    zf: zipfile.ZipFile, members: dict[uuid.UUID, zipfile.ZipInfo], dest_dir: Path
+) -> dict[uuid.UUID, StoredCard]:
+    """
+    Stream each member to ``dest_dir/<uuid>.png`` (blocking; run it with
+    ``run_io``). Every member is inflated and checked into a scratch file
+    first; only when all of them are good are they stored (each appearing
+    atomically, via the blob store). A member that inflates past its
+    declared size or fails its CRC aborts the upload with no card replaced.
+    """
+    tmps: List[Path] = []
+    checked: dict[uuid.UUID, tuple[Path, Path, str]] = {}  # id → (scratch, dest, sha256)
+    try:
+        for rec_id, info in members.items():
+            dest_path = dest_dir / f"{rec_id}.png"
+            tmps.append(tmp := temp_path(dest_path))
+            try:
+                with zf.open(info) as src:
+                    spooled = copy_to(src, tmp, limit=info.file_size)
+            except ValueError:
+                raise ValueError(f"{info.filename!r} is larger than declared")
+            checked[rec_id] = (tmp, dest_path, spooled.digest.hexdigest())
+
+        return {rec_id: store_card(*card) for rec_id, card in checked.items()}
+    finally:
+        for tmp in tmps:  # store_card consumed the ones it got to
+            tmp.unlink(missing_ok=True)
+
+
+async def _attach_zip(
+    db: AsyncSession,
+    background_tasks: BackgroundTasks,
+    *,
+    current: User,
+    batch: Batch,
+    src: BinaryIO | Path,
+    details: dict,
+) -> Batch:
+    """
+    Extract the ``<uuid>.png`` members of the archive *src* that match the
+    batch's records and attach them; other entries are ignored.
+    """
+    try:
+        # reads the central directory: seeks and reads on a possibly huge file
+        zf = await run_io(zipfile.ZipFile, src)
+    except zipfile.BadZipFile:
+        raise HTTPException(400, detail="Not a ZIP archive")
+
+    with zf:
         try:
-            rec_id = uuid.UUID(f.filename.rsplit(".", 1)[0])
-        except ValueError:
-            continue  # filename not a UUID – ignore
-
-        if rec_id not in records_by_id:
-            continue  # no matching record in this batch
-
-        # stream-save
-        dest_path = dest_dir / f.filename
-        with dest_path.open("wb") as out:
-            for chunk in iter(lambda: f.file.read(CHUNK), b""):
-                out.write(chunk)
-
-        # update record
-        rec = records_by_id[rec_id]
-        rec.card_filename = str(dest_path.relative_to(CARDS_ROOT))
-        rec.generated_at = now
-        rec.status = RecordStatus.generated
-        saved += 1
-
-    # flush all modified records
-    await db.commit()
+            members = await run_io(_scan_zip, zf)
+        except ValueError as exc:
+            raise HTTPException(400, detail=f"Rejected archive: {exc}")
 
-    # ── update batch counters / status ────────────────────────
-    batch.processed_records = saved
-    if saved == 0:
-        batch.status = BatchStatus.pending
-    elif saved == batch.total_records:
-        batch.status = BatchStatus.completed
-    else:
-        batch.status = BatchStatus.processing
+        existing = await existing_ids(db, batch, list(members))
+        members = {k: v for k, v in members.items() if k in existing}
+
+        try:
+            saved = await run_io(_extract_cards, zf, members, card_dest_dir(batch))
+        except (ValueError, zipfile.BadZipFile, zlib.error) as exc:
+            raise HTTPException(400, detail=f"Rejected archive: {exc}")
 
+    _queue_thumbnails(card.path for card in saved.values())
+    await attach_cards(db, batch, saved)
     await db.commit()
     await db.refresh(batch)
+    await publish_batch(db, batch.id)
+    _queue_optimize(batch, saved)
 
-    # ── audit entry async ─────────────────────────────────────
     background_tasks.add_task(
         _log,
         db=db,
@@ -168,7 +342,320 @@ async def upload_cards(
         entity_type="batch",
         entity_id=batch.id,
         action="upload_cards",
-        details={"files": saved},
+        details={"files": len(saved), **details},
+    )
+    return batch
+
+
+@router.post(
+    "/upload-zip",
+    response_model=BatchRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def upload_cards_zip(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),                 # one .zip of <uuid>.png cards
+    batch_id: uuid.UUID = Query(...),
+    company_id: uuid.UUID | None = Query(None),   # optional for owners
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    """
+    ZIP counterpart of ``/cards/upload``: ``<uuid>.png`` entries are matched
+    to the batch's records and extracted one by one; other entries are ignored.
+    """
+    batch = await db.get(Batch, batch_id)
+    if not batch:
+        raise HTTPException(404, detail="Batch not found")
+
+    _company_guard(current, batch)
+
+    if company_id and company_id != batch.company_id:
+        raise HTTPException(400, detail="company_id does not match batch")
+
+    # the multipart parser already spooled the body to a seekable temp file,
+    # which is all zipfile needs: members are inflated straight from it
+    return await _attach_zip(
+        db,
+        background_tasks,
+        current=current,
+        batch=batch,
+        src=file.file,
+        details={"zip": file.filename},
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# 1C. Render a batch's cards on the server
+# ──────────────────────────────────────────────────────────────
+@router.post(
+    "/batch/{batch_id}/render",
+    response_model=BatchRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def render_batch_cards(
+    batch_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    """
+    Queue server-side rendering of the batch's pending and failed records.
+    Records move to ``generating``; progress shows up on the batch as cards
+    are written.
+    """
+    batch = await db.get(Batch, batch_id)
+    if not batch:
+        raise HTTPException(404, detail="Batch not found")
+
+    _company_guard(current, batch)
+
+    try:
+        render_batch.delay(str(batch.id))
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(503, detail=f"Could not queue rendering: {exc}") from exc
+
+    background_tasks.add_task(
+        _log,
+        db=db,
+        user_id=current.id,
+        entity_type="batch",
+        entity_id=batch.id,
+        action="render_cards",
+        details={},
     )
+    return batch
+
+
+# ──────────────────────────────────────────────────────────────
+# 2. Attach an already-assembled file (resumable uploads)
+# ──────────────────────────────────────────────────────────────
+async def finalize_card_upload(
+    db: AsyncSession,
+    background_tasks: BackgroundTasks,
+    *,
+    current: User,
+    batch: Batch,
+    filename: str,
+    src_path: Path,
+) -> Batch:
+    """Move a fully received ``<uuid>.png`` into the batch's card folder (via the blob store)."""
+    rec_id = _record_id(filename)
+    if rec_id is None:
+        raise HTTPException(400, detail="Card file must be named <record-uuid>.png")
+
+    if not await existing_ids(db, batch, [rec_id]):
+        raise HTTPException(404, detail="No such record in this batch")
 
+    # same volume → the received file becomes the blob (a link, no copy)
+    card = await run_io(store_card, src_path, card_dest_dir(batch) / filename)
+
+    _queue_thumbnails([card.path])
+    await attach_cards(db, batch, {rec_id: card})
+    await db.commit()
+    await db.refresh(batch)
+    await publish_batch(db, batch.id)
+    _queue_optimize(batch, [rec_id])
+
+    background_tasks.add_task(
+        _log,
+        db=db,
+        user_id=current.id,
+        entity_type="batch",
+        entity_id=batch.id,
+        action="upload_cards",
+        details={"files": 1, "resumable": True},
+    )
     return batch
+
+
+async def finalize_archive_upload(
+    db: AsyncSession,
+    background_tasks: BackgroundTasks,
+    *,
+    current: User,
+    batch: Batch,
+    filename: str,
+    src_path: Path,
+) -> Batch:
+    """Extract a fully received ZIP of ``<uuid>.png`` cards, as ``/cards/upload-zip`` does."""
+    return await _attach_zip(
+        db,
+        background_tasks,
+        current=current,
+        batch=batch,
+        src=src_path,
+        details={"zip": filename, "resumable": True},
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# 3. Download every generated card of a batch as one ZIP
+# ──────────────────────────────────────────────────────────────
+def _archive_members(card_filenames: List[str]) -> List[ZipMember]:
+    members = []
+    for rel in card_filenames:
+        try:
+            members.append(ZipMember.from_path(CARDS_ROOT / rel))
+        except FileNotFoundError:
+            continue  # record points at a card that is gone; leave it out
+    return members
+
+
+@router.get(
+    "/batch/{batch_id}/archive",
+    response_class=StreamingResponse,
+    summary="ZIP of all generated cards in a batch (resumable)",
+)
+async def download_batch_archive(
+    batch_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(
+        get_current_user_or_scoped_token(
+            lambda request: card_scope(request.path_params["batch_id"])
+        )
+    ),
+):
+    """
+    Streams ``<uuid>.png`` for every generated record, built on the fly from
+    the card files (STORED entries, nothing buffered). The layout is fixed by
+    the files' names, sizes and mtimes, so the response carries a strong
+    ETag and honours ``Range`` / ``If-Range`` to resume a broken download.
+    A plain download link can pass the batch's card token (``POST
+    /cards/batch/{id}/token``) as ``?access_token=``.
+    """
+    batch = await db.get(Batch, batch_id)
+    if not batch:
+        raise HTTPException(404, detail="Batch not found")
+
+    _company_guard(current, batch)
+
+    card_filenames = (
+        await db.execute(
+            select(CollabCard.card_filename)
+            .where(
+                CollabCard.batch_id == batch.id,
+                CollabCard.status == RecordStatus.generated,
+                CollabCard.card_filename.is_not(None),
+            )
+            .order_by(CollabCard.id)
+        )
+    ).scalars().all()
+    archive = StoredZip(await run_in_threadpool(_archive_members, card_filenames))
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": archive.etag,
+        "Content-Disposition": f'attachment; filename="cards-{batch.id}.zip"',
+    }
+    requested = byte_range(
+        request.headers.get("range"), request.headers.get("if-range"), archive.size, archive.etag
+    )
+    if requested is None:
+        start, stop, status_code = 0, archive.size, 200
+    else:
+        start, stop = requested
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{archive.size}"
+    headers["Content-Length"] = str(stop - start)
+
+    return StreamingResponse(
+        iterate_in_threadpool(archive.iter_range(start, stop)),
+        status_code=status_code,
+        media_type="application/zip",
+        headers=headers,
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# 4. Serve one card image (or its preview)
+# ──────────────────────────────────────────────────────────────
+@router.post("/batch/{batch_id}/token", response_model=ScopedToken)
+async def card_token(
+    batch_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    """``?access_token=`` for the card and preview URLs of one batch."""
+    batch = await db.get(Batch, batch_id)
+    if not batch:
+        raise HTTPException(404, detail="Batch not found")
+    _company_guard(current, batch)
+
+    token, expires_at = create_scoped_token(current.email, card_scope(batch.id))
+    return ScopedToken(access_token=token, expires_at=expires_at)
+
+
+@router.get(
+    "/{owner}/{batch_id}/{filename}",
+    summary="A card PNG or its .thumb.webp preview",
+    responses={200: {"content": {"image/png": {}, "image/webp": {}}}, 304: {}, 206: {}},
+)
+async def get_card_file(
+    owner: str,                                   # company id, or "global"
+    batch_id: uuid.UUID,
+    filename: str,
+    request: Request,
+    v: str | None = Query(None, description="version, as in card_url / thumbnail_url"),
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(
+        get_current_user_or_scoped_token(
+            lambda request: card_scope(request.path_params["batch_id"])
+        )
+    ),
+):
+    """
+    The path is the record's ``card_filename`` (or its preview's). Only
+    users of the batch's company (and owners) get it; ``<img>`` tags can
+    pass a token from ``POST /cards/batch/{id}/token`` as ``?access_token=``.
+
+    The ETag is the card's SHA-256, so revalidation is a 304 without
+    touching the file. Requested with the current ``?v=``, the response is
+    cacheable for good; otherwise it must be revalidated every time.
+    """
+    thumb = filename.endswith(THUMB_SUFFIX)
+    rec_id = _record_id(filename.removesuffix(THUMB_SUFFIX) + ".png" if thumb else filename)
+    if rec_id is None:
+        raise HTTPException(404, detail="Card not found")
+
+    batch = await db.get(Batch, batch_id)
+    if not batch:
+        raise HTTPException(404, detail="Batch not found")
+
+    _company_guard(current, batch)
+
+    row = (
+        await db.execute(
+            select(CollabCard.card_filename, CollabCard.card_sha256, CollabCard.generated_at)
+            .where(CollabCard.id == rec_id, CollabCard.batch_id == batch.id)
+        )
+    ).one_or_none()
+    # only ever the file the record points at: the path comes from the DB
+    rel = f"{owner}/{batch_id}/{filename}"
+    if row is None or not row.card_filename or rel != (
+        thumb_name(row.card_filename) if thumb else row.card_filename
+    ):
+        raise HTTPException(404, detail="Card not found")
+
+    path = CARDS_ROOT / rel
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise HTTPException(404, detail="Card not found")
+
+    if row.card_sha256:
+        etag = f'"{row.card_sha256}{".thumb" if thumb else ""}"'
+    else:  # stored before cards were content-addressed
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    return file_response(
+        request,
+        path,
+        st,
+        etag=etag,
+        cache_control=(
+            CACHE_IMMUTABLE if v == card_version(row.card_sha256, row.generated_at)
+            else CACHE_REVALIDATE
+        ),
+        media_type="image/webp" if thumb else "image/png",
+    )
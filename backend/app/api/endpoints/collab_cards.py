@@ -1,12 +1,16 @@
 # backend/app/api/endpoints/collabcards.py
 from __future__ import annotations
 
-import re
-import unicodedata
+import base64
+import datetime as dt
+import hashlib
+import shutil
 import uuid
-from pathlib import Path
-from typing import Dict, List
+from functools import partial
+from pathlib import Path, PurePath
+from typing import AsyncIterator, List
 
+import anyio
 from fastapi import (
     APIRouter,
     BackgroundTasks,
@@ -14,19 +18,38 @@ from fastapi import (
     File,
     HTTPException,
     Query,
+    Request,
+    Response,
     UploadFile,
     status,
 )
-from openpyxl import load_workbook
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user, get_db
+from app.api.dependencies import get_current_user, get_current_user_or_scoped_token, get_db
+from app.api.files import etag_matches
+from app.api.spool import run_io, spool
 from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
 from app.models import AuditLog, Batch, CollabCard, User
 from app.models.enums import BatchStatus
 from app.models.user import Role
-from app.schemas.batch import BatchRead
+from app.schemas.batch import BatchRead, BatchSummary, RejectionPage
 from app.schemas.collabcard import CollabCardCreate, CollabCardRead
+from app.schemas.token import ScopedToken
+from app.services.bulk import (
+    bulk_insert_collabcards,
+    clone_batch_records,
+    ingest_into_batch,
+    upsert_into_batch,
+)
+from app.services.events import encode_event, event_columns, hub
+from app.services.ingest import aiter_csv_records
+from app.services.rejections import REJECTIONS_FILE, RejectionLog, read_rejections
+from app.services.security import create_scoped_token, events_scope
+from app.services.summary import batch_counts
+from app.services.tasks import ingest_xlsx
 
 # ────────────────────────────────────────────────
 # NEW 3. Create batch from existing users
@@ -41,36 +64,11 @@ router = APIRouter(prefix="/collabcards", tags=["collabcards"])
 settings = get_settings()
 
 UPLOAD_ROOT = Path(settings.upload_dir or "/data/uploads").joinpath("records")
-
-
-def _collapse(text: str | None) -> str:
-    """lower-case, strip accents & punctuation; return '' for None."""
-    if not isinstance(text, str):
-        return ""
-    text = text.lower()
-    text = "".join(
-        c for c in unicodedata.normalize("NFD", text) if unicodedata.category(c) != "Mn"
-    )
-    return re.sub(r"[^a-z0-9]+", "", text)
-
-
-SPANISH_TO_ENGLISH: Dict[str, str] = {
-    _collapse("Nombre"): "full_name",
-    _collapse("Correo Electrónico"): "email",
-    _collapse("Correo Electronico"): "email",
-    _collapse("Correo"): "email",
-    _collapse("Celular"): "mobile_phone",
-    _collapse("Puesto"): "job_title",
-    _collapse("Teléfono Oficina"): "office_phone",
-    _collapse("Teléfono Ofi"): "office_phone",
-    _collapse("Telefono Ofi"): "office_phone",
-}
-
-HEADER_KEY = _collapse("Nombre")  # first entry → used to spot header rows
-STR_FIELDS = {"full_name", "email", "mobile_phone", "job_title", "office_phone"}
-REQUIRED_FIELDS = {"full_name", "email", "job_title"}
-BATCH_SIZE = 5_000
-UPLOAD_CHUNK = 1_048_576  # 1 MiB
+RECORDS_PAGE = 500          # default page of /batch/{id}/records …
+RECORDS_PAGE_MAX = 2_000    # … and the most a client may ask for
+RECORDS_STREAM_CHUNK = 1_000  # rows per fetch from the server-side cursor
+EVENTS_KEEPALIVE = 15       # seconds of silence before /events sends a comment line
+EVENTS_RETRY = 5            # seconds an EventSource waits before reconnecting
 
 # ──────────────────────────────────────────────────────────────
 # helpers (unchanged)
@@ -106,6 +104,47 @@ def _company_guard(current: User, company_id: uuid.UUID | None) -> uuid.UUID | N
     return current.company_id
 
 
+def _batch_dir(company_id: uuid.UUID | None, batch_id: uuid.UUID) -> Path:
+    """Where a batch's upload and its rejections.bin live."""
+    return UPLOAD_ROOT / (str(company_id) if company_id else "global") / str(batch_id)
+
+
+def _fold_sheets(digest: "hashlib._Hash", sheets: List[str] | None) -> str:
+    if sheets:
+        # same bytes, different sheets → different batch contents
+        digest.update(b"\0sheets:" + "\0".join(sheets).encode())
+    return digest.hexdigest()
+
+
+async def _batch_to_update(db: AsyncSession, current: User, batch_id: uuid.UUID) -> Batch:
+    batch = await db.get(Batch, batch_id)
+    if not batch:
+        raise HTTPException(404, detail="Batch not found")
+    _company_guard(current, batch.company_id)  # raises if forbidden
+    if batch.status == BatchStatus.processing:
+        raise HTTPException(409, detail="Batch is still being processed")
+    return batch
+
+
+async def _claim_for_merge(db: AsyncSession, batch: Batch) -> None:
+    """
+    Mark *batch* ``processing`` for the merge about to run (the merge's own
+    recount sets the final status). Conditional, so of two merges racing
+    past :func:`_batch_to_update` only one wins; the other gets a 409.
+    """
+    cols = Batch.__table__.c
+    res = await db.execute(
+        update(Batch.__table__)
+        .where(cols.id == batch.id, cols.status != BatchStatus.processing)
+        .values(status=BatchStatus.processing)
+    )
+    if res.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(409, detail="Batch is still being processed")
+    await db.commit()
+    await db.refresh(batch)
+
+
 # ────────────────────────────────────────────────
 # 1. Single record endpoint (unchanged)
 # ────────────────────────────────────────────────
@@ -152,8 +191,147 @@ async def create_single_collabcard(
     return record
 
 
+async def _find_duplicate_batch(
+    db: AsyncSession, company_id: uuid.UUID | None, content_sha256: str
+) -> Batch | None:
+    """Latest batch of *company_id* built from identical content, unless it failed."""
+    stmt = (
+        select(Batch)
+        .where(
+            Batch.content_sha256 == content_sha256,
+            Batch.company_id.is_(None) if company_id is None else Batch.company_id == company_id,
+            Batch.status != BatchStatus.error,
+        )
+        .order_by(Batch.created_at.desc())
+        .limit(1)
+    )
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+def _copy_rejections(source_dir: Path, dest_dir: Path) -> None:
+    """Blocking: copy a batch's rejections.bin to another batch's folder, if it has one."""
+    report = source_dir / REJECTIONS_FILE
+    if report.exists():
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(report, dest_dir / REJECTIONS_FILE)
+
+
+async def _clone_batch(db: AsyncSession, source: Batch, current: User) -> Batch:
+    """Fresh pending batch with *source*'s records, copied server-side."""
+    batch = Batch(
+        company_id=source.company_id,
+        created_by=current.id,
+        original_filename=source.original_filename,
+        content_sha256=source.content_sha256,
+        status=BatchStatus.pending,
+    )
+    db.add(batch)
+    await db.flush()
+    batch.total_records = await clone_batch_records(db, source, batch)
+    batch.processed_records = 0
+    batch.rejected_records = source.rejected_records
+
+    await run_io(
+        _copy_rejections,
+        _batch_dir(source.company_id, source.id),
+        _batch_dir(batch.company_id, batch.id),
+    )
+    await db.commit()
+    await db.refresh(batch)
+    return batch
+
+
+def xlsx_filename(filename: str) -> str:
+    """*filename* if it is a bare ``.xlsx`` name; 400 for paths and anything else."""
+    if not filename.lower().endswith(".xlsx"):
+        raise HTTPException(400, detail="File must be .xlsx")
+    if "/" in filename or "\\" in filename or PurePath(filename).name != filename:
+        raise HTTPException(400, detail="File name must not contain a path")
+    return filename
+
+
+def new_xlsx_batch(
+    current: User, company_id: uuid.UUID | None, filename: str
+) -> tuple[Batch, Path]:
+    """
+    Unsaved ``processing`` batch plus the path its spreadsheet must be spooled
+    to. The id is assigned up front: the batch is only persisted if the upload
+    turns out not to be a retry (see :func:`queue_xlsx_batch`).
+    """
+    batch = Batch(
+        id=uuid.uuid4(),
+        company_id=company_id,
+        created_by=current.id,
+        original_filename=filename,
+        status=BatchStatus.processing,
+    )
+    dest_dir = _batch_dir(company_id, batch.id)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    return batch, dest_dir / PurePath(filename).name
+
+
+async def queue_xlsx_batch(
+    db: AsyncSession,
+    background_tasks: BackgroundTasks,
+    *,
+    current: User,
+    batch: Batch,
+    dest_path: Path,
+    digest: "hashlib._Hash",
+    sheets: List[str] | None,
+    clone: bool,
+) -> Batch:
+    """
+    Hand a spooled spreadsheet to the worker, or short-circuit to the batch
+    already built from the same content. *digest* is the sha256 of the file.
+    """
+    content_sha256 = _fold_sheets(digest, sheets)
+
+    # ── retry of an upload we already have? ──────────────────
+    duplicate = await _find_duplicate_batch(db, batch.company_id, content_sha256)
+    if duplicate is not None:
+        await run_io(partial(shutil.rmtree, dest_path.parent, ignore_errors=True))
+        source_id = duplicate.id
+        if clone and duplicate.status != BatchStatus.processing:
+            duplicate = await _clone_batch(db, duplicate, current)
+        background_tasks.add_task(
+            _log,
+            db=db,
+            user_id=current.id,
+            entity_type="batch",
+            entity_id=duplicate.id,
+            action="upload_xlsx_duplicate",
+            details={"filename": batch.original_filename, "duplicate_of": str(source_id)},
+        )
+        return duplicate
+
+    batch.content_sha256 = content_sha256
+    db.add(batch)
+    await db.commit()
+    await db.refresh(batch)
+
+    # ── parse & insert in the worker; progress lands on the batch ──
+    try:
+        ingest_xlsx.delay(str(batch.id), str(dest_path), sheets)
+    except Exception as exc:  # noqa: BLE001
+        batch.status = BatchStatus.error
+        await db.commit()
+        raise HTTPException(503, detail=f"Could not queue ingest: {exc}") from exc
+
+    background_tasks.add_task(
+        _log,
+        db=db,
+        user_id=current.id,
+        entity_type="batch",
+        entity_id=batch.id,
+        action="upload_xlsx",
+        details={"filename": batch.original_filename, "sheets": sheets},
+    )
+    return batch
+
+
 # ────────────────────────────────────────────────
-# 2. XLSX upload (streaming)
+# 2. XLSX upload (spooled here, parsed by the worker)
 # ────────────────────────────────────────────────
 @router.post(
     "/upload-xlsx",
@@ -164,115 +342,181 @@ async def upload_collabcard_xlsx(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     company_id: uuid.UUID | None = Query(None),
+    sheets: List[str] | None = Query(
+        None,
+        description="Sheet names to ingest into this batch, or `*` for every sheet. "
+        "Defaults to the active sheet only.",
+    ),
+    clone: bool = Query(
+        False,
+        description="If this exact upload was already ingested, return a fresh copy "
+        "of that batch instead of the batch itself.",
+    ),
+    batch_id: uuid.UUID | None = Query(
+        None,
+        description="Merge into this existing batch instead of creating one: rows are "
+        "matched by email and only new or changed rows go back to pending.",
+    ),
     db: AsyncSession = Depends(get_db),
     current: User = Depends(get_current_user),
 ):
-    if not file.filename.lower().endswith(".xlsx"):
-        raise HTTPException(400, detail="File must be .xlsx")
+    xlsx_filename(file.filename)
 
-    target_company_id = _company_guard(current, company_id)
+    if batch_id is not None:
+        return await _update_batch_from_xlsx(
+            db, background_tasks, current=current, batch_id=batch_id, file=file, sheets=sheets
+        )
 
-    batch = Batch(
-        company_id=target_company_id,
-        created_by=current.id,
-        original_filename=file.filename,
-        status=BatchStatus.processing,
+    target_company_id = _company_guard(current, company_id)
+    batch, dest_path = new_xlsx_batch(current, target_company_id, file.filename)
+
+    # ── save upload, hashing as we go ─────────────────────────
+    digest = (await spool(file, dest_path)).digest
+
+    return await queue_xlsx_batch(
+        db,
+        background_tasks,
+        current=current,
+        batch=batch,
+        dest_path=dest_path,
+        digest=digest,
+        sheets=sheets,
+        clone=clone,
     )
-    db.add(batch)
-    await db.flush()
 
-    # ── save upload ───────────────────────────────────────────
-    dest_dir = (
-        UPLOAD_ROOT
-        / (str(target_company_id) if target_company_id else "global")
-        / str(batch.id)
-    )
-    dest_dir.mkdir(parents=True, exist_ok=True)
-    dest_path = dest_dir / file.filename
-    with dest_path.open("wb") as out:
-        for chunk in iter(lambda: file.file.read(UPLOAD_CHUNK), b""):
-            out.write(chunk)
 
-    try:
-        wb = load_workbook(dest_path, read_only=True, data_only=True)
-        ws = wb.active
-
-        # ── detect header row ────────────────────────────────
-        header_map: Dict[int, str] = {}
-        for row in ws.iter_rows(values_only=True):
-            mapped = [SPANISH_TO_ENGLISH.get(_collapse(c), "") for c in row]
-            header_map = {ix: f for ix, f in enumerate(mapped) if f}
-            if REQUIRED_FIELDS <= set(header_map.values()):
-                break
-
-        if not header_map:
-            raise ValueError(f"missing columns {REQUIRED_FIELDS}")
-
-        buffer: List[CollabCard] = []
-        total = 0
-
-        # ── row loop ───────────────────────────────────────────
-        for row in ws.iter_rows(values_only=True):
-            if not any(row):
-                continue  # blank
-
-            # skip any row whose first mapped cell still contains "nombre"
-            if _collapse(row[min(header_map)]) == HEADER_KEY:
-                continue
+async def _update_batch_from_xlsx(
+    db: AsyncSession,
+    background_tasks: BackgroundTasks,
+    *,
+    current: User,
+    batch_id: uuid.UUID,
+    file: UploadFile,
+    sheets: List[str] | None,
+) -> Batch:
+    """``upload-xlsx?batch_id=…``: queue a merge of a corrected file into *batch_id*."""
+    batch = await _batch_to_update(db, current, batch_id)
+
+    # never the batch's original upload (or an earlier merge) the worker may still read
+    dest_dir = _batch_dir(batch.company_id, batch.id)
+    dest_path = dest_dir / f"update-{uuid.uuid4().hex}-{PurePath(file.filename).name}"
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    digest = (await spool(file, dest_path)).digest
+
+    content_sha256 = _fold_sheets(digest, sheets)
+    if content_sha256 == batch.content_sha256:
+        dest_path.unlink(missing_ok=True)
+        return batch  # same file again: nothing can have changed
+
+    # content_sha256 is only stored by the worker, with the merged rows
+    previous_status = batch.status
+    await _claim_for_merge(db, batch)
 
-            record = {
-                header_map[ix]: val
-                for ix, val in enumerate(row)
-                if ix in header_map and val not in (None, "")
-            }
+    try:
+        ingest_xlsx.delay(str(batch.id), str(dest_path), sheets, True, content_sha256)
+    except Exception as exc:  # noqa: BLE001
+        batch.status = previous_status
+        await db.commit()
+        dest_path.unlink(missing_ok=True)
+        raise HTTPException(503, detail=f"Could not queue ingest: {exc}") from exc
 
-            if REQUIRED_FIELDS - record.keys():
-                continue  # missing mandatory data
+    background_tasks.add_task(
+        _log,
+        db=db,
+        user_id=current.id,
+        entity_type="batch",
+        entity_id=batch.id,
+        action="upload_xlsx_update",
+        details={"filename": file.filename, "sheets": sheets},
+    )
+    return batch
 
-            # coerce strings & trim
-            for k in STR_FIELDS:
-                if k in record and record[k] is not None:
-                    record[k] = str(record[k]).strip()
 
-            full_name = record.get("full_name", "")
-            if full_name.isdigit():   # row-number row
-                continue
+# ────────────────────────────────────────────────
+# 2B. CSV / TSV upload (parsed straight off the request body)
+# ────────────────────────────────────────────────
+@router.post(
+    "/upload-csv",
+    response_model=BatchRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_collabcard_csv(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    filename: str | None = Query(None, description="Original file name, for display"),
+    company_id: uuid.UUID | None = Query(None),
+    batch_id: uuid.UUID | None = Query(
+        None,
+        description="Merge into this existing batch instead of creating one "
+        "(see upload-xlsx).",
+    ),
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    """
+    Raw CSV/TSV body (``Content-Type: text/csv``), not multipart.
 
-            buffer.append(
-                CollabCard(
-                    batch_id=batch.id,
-                    company_id=target_company_id,
-                    created_by=current.id,
-                    **record,
-                )
+    Encoding and delimiter are sniffed; rows are inserted ``BATCH_SIZE`` at a
+    time while the body is still arriving, so nothing is spooled to disk
+    except the rejection report.
+    """
+    if batch_id is not None:
+        batch = await _batch_to_update(db, current, batch_id)
+        await _claim_for_merge(db, batch)
+        report_dir = _batch_dir(batch.company_id, batch.id)
+        report_dir.mkdir(parents=True, exist_ok=True)
+        rejections = RejectionLog(report_dir / REJECTIONS_FILE, sheets=[filename or ""])
+        try:
+            counts = await upsert_into_batch(
+                db, batch, aiter_csv_records(request.stream(), rejections), rejections
             )
-            total += 1
-            if len(buffer) >= BATCH_SIZE:
-                db.add_all(buffer)
-                buffer.clear()
+        except Exception as exc:  # noqa: BLE001
+            raise HTTPException(400, detail=f"Parse error: {exc}") from exc
+
+        await db.refresh(batch)
+        background_tasks.add_task(
+            _log,
+            db=db,
+            user_id=current.id,
+            entity_type="batch",
+            entity_id=batch.id,
+            action="upload_csv_update",
+            details={"filename": filename, **counts},
+        )
+        return batch
 
-        if buffer:
-            db.add_all(buffer)
+    target_company_id = _company_guard(current, company_id)
 
-        batch.total_records = total
-        batch.processed_records = 0
-        batch.status = BatchStatus.pending
-        await db.commit()
+    batch = Batch(
+        company_id=target_company_id,
+        created_by=current.id,
+        original_filename=filename,
+        status=BatchStatus.processing,
+    )
+    db.add(batch)
+    await db.commit()
 
+    report_dir = _batch_dir(target_company_id, batch.id)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    rejections = RejectionLog(report_dir / REJECTIONS_FILE, sheets=[filename or ""])
+
+    try:
+        await ingest_into_batch(
+            db, batch, aiter_csv_records(request.stream(), rejections), rejections
+        )
     except Exception as exc:  # noqa: BLE001
-        await db.rollback()
-        batch.status = BatchStatus.error
-        await db.commit()
         raise HTTPException(400, detail=f"Parse error: {exc}") from exc
 
+    await db.refresh(batch)
+
     background_tasks.add_task(
         _log,
         db=db,
         user_id=current.id,
         entity_type="batch",
         entity_id=batch.id,
-        action="upload_xlsx",
-        details={"filename": file.filename, "records": batch.total_records},
+        action="upload_csv",
+        details={"filename": filename, "records": batch.total_records},
     )
     return batch
 
@@ -377,22 +621,23 @@ async def create_collabcard_batch_from_users(
     db.add(batch)
     await db.flush()  # we need batch.id
 
-    # ── create CollabCard rows in chunks for efficiency ─────────
-    buffer: list[CollabCard] = []
-    for usr in users:
-        buffer.append(
-            CollabCard(
-                batch_id=batch.id,
-                company_id=target_company_id,
-                created_by=current.id,
-                full_name=usr.card_full_name or usr.email.split("@")[0],
-                email=usr.card_email or usr.email,
-                mobile_phone=usr.card_mobile_phone,
-                job_title=usr.card_job_title,
-                office_phone=usr.card_office_phone,
-            )
-        )
-    db.add_all(buffer)
+    # ── bulk-insert CollabCard rows (COPY on PostgreSQL) ─────────
+    await bulk_insert_collabcards(
+        db,
+        (
+            {
+                "full_name": usr.card_full_name or usr.email.split("@")[0],
+                "email": usr.card_email or usr.email,
+                "mobile_phone": usr.card_mobile_phone,
+                "job_title": usr.card_job_title,
+                "office_phone": usr.card_office_phone,
+            }
+            for usr in users
+        ),
+        batch_id=batch.id,
+        company_id=target_company_id,
+        created_by=current.id,
+    )
     await db.commit()
     await db.refresh(batch)
 
@@ -433,11 +678,24 @@ def _assert_owner_or_admin(user: User) -> None:
 # ────────────────────────────────────────────────
 """
 GET /collabcards/pending-batches
-Purpose: All batches for a company created in the last 7 days where processed_records < total_records.
+Purpose: All batches for a company created in the last 7 days that are still being ingested
+(status = processing) or have processed_records < total_records.
 Who can call: Owner / Administrator (global or company).
 """
 from datetime import datetime, timedelta
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_
+
+
+def _in_flight(company_id: uuid.UUID):
+    return and_(
+        Batch.company_id == company_id,
+        Batch.created_at >= datetime.utcnow() - timedelta(days=7),
+        or_(
+            # total_records stays 0 until the ingest has read the whole file
+            Batch.status == BatchStatus.processing,
+            Batch.processed_records < Batch.total_records,
+        ),
+    )
 
 @router.get(
     "/pending-batches",
@@ -453,8 +711,8 @@ async def list_pending_batches(
     current: User = Depends(get_current_user),
 ):
     """
-    Returns batches **created in the last 7 days** whose
-    `processed_records < total_records`.
+    Returns batches **created in the last 7 days** that are still being
+    ingested (`status = processing`) or whose `processed_records < total_records`.
 
     * Global owners / administrators – provide any `company_id`.  
     * Company owners / administrators – omit `company_id`
@@ -468,17 +726,9 @@ async def list_pending_batches(
             400, detail="company_id is required for a global query"
         )
 
-    seven_days_ago = datetime.utcnow() - timedelta(days=7)
-
     stmt = (
         select(Batch)
-        .where(
-            and_(
-                Batch.company_id == target_company_id,
-                Batch.created_at >= seven_days_ago,
-                Batch.processed_records < Batch.total_records,
-            )
-        )
+        .where(_in_flight(target_company_id))
         .order_by(Batch.created_at.desc())
     )
     res = await db.execute(stmt)
@@ -486,43 +736,314 @@ async def list_pending_batches(
 
 
 # ────────────────────────────────────────────────
-# 6. Get all CollabCards for a specific batch
+# 5B. Live batch progress (Server-Sent Events)
 # ────────────────────────────────────────────────
+async def _batch_events(company_id: uuid.UUID) -> AsyncIterator[bytes]:
+    # its own session: the request's one is closed once the response starts
+    async with hub.listen(company_id) as listener:
+        # subscribed before the snapshot is read, so no change falls in between
+        async with AsyncSessionLocal() as db:
+            rows = (
+                await db.execute(
+                    select(*event_columns())
+                    .where(_in_flight(company_id))
+                    .order_by(Batch.created_at.desc())
+                )
+            ).mappings().all()
+        yield b"retry: %d\n\n" % (EVENTS_RETRY * 1000)
+        yield b"".join(_sse(encode_event(row)) for row in rows)
+
+        while True:
+            with anyio.move_on_after(EVENTS_KEEPALIVE) as idle:
+                payloads = await listener.get()
+            if idle.cancelled_caught:
+                yield b": keepalive\n\n"  # comment line: keeps proxies from timing out
+                continue
+            yield b"".join(_sse(p) for p in payloads)
+
+
+def _sse(payload: str) -> bytes:
+    return b"event: batch\ndata: " + payload.encode() + b"\n\n"
+
+
+@router.post("/events/token", response_model=ScopedToken)
+async def batch_events_token(
+    company_id: uuid.UUID | None = Query(
+        None,
+        description="Company to watch (required for global owners/admins)",
+    ),
+    current: User = Depends(get_current_user),
+):
+    """
+    url: /collabcards/events/token
+    purpose: `access_token` for `GET /collabcards/events?company_id=…`,
+    which `EventSource` opens without headers. Only valid for that stream.
+    who can: Owner / Administrator (global or company).
+    """
+    _assert_owner_or_admin(current)
+
+    target_company_id = _company_guard(current, company_id)
+    if target_company_id is None:
+        raise HTTPException(
+            400, detail="company_id is required for a global query"
+        )
+
+    token, expires_at = create_scoped_token(current.email, events_scope(target_company_id))
+    return ScopedToken(access_token=token, expires_at=expires_at)
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    summary="Progress of a company's batches, pushed as Server-Sent Events",
+)
+async def stream_batch_events(
+    company_id: uuid.UUID | None = Query(
+        None,
+        description="Company to watch (required for global owners/admins)",
+    ),
+    current: User = Depends(
+        get_current_user_or_scoped_token(
+            lambda request: events_scope(request.query_params.get("company_id"))
+        )
+    ),
+):
+    """
+    url: /collabcards/events
+    purpose: Replaces polling `pending-batches` while uploads run.
+    who can: Owner / Administrator (global or company).
+
+    A `text/event-stream`. It opens with one `batch` event per in-flight
+    batch (same rule as `pending-batches`), then sends a `batch` event with
+    the whole batch (`BatchRead` fields plus `company_id` and `updated_at`)
+    each time an ingest, card upload or render commits progress, from any
+    API or worker process. `EventSource` can't send headers: pass a
+    token from `POST /collabcards/events/token` as `access_token`, with
+    the same `company_id`.
+    """
+    _assert_owner_or_admin(current)
+
+    target_company_id = _company_guard(current, company_id)
+    if target_company_id is None:
+        raise HTTPException(
+            400, detail="company_id is required for a global query"
+        )
+
+    return StreamingResponse(
+        _batch_events(target_company_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ────────────────────────────────────────────────
+# 6. Get the CollabCards of a specific batch
+# ────────────────────────────────────────────────
+def _encode_cursor(record: CollabCard) -> str:
+    raw = f"{record.created_at.isoformat()}|{record.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[dt.datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, rec_id = raw.partition("|")
+        return dt.datetime.fromisoformat(created_at), uuid.UUID(rec_id)
+    except ValueError:
+        raise HTTPException(400, detail="Invalid cursor")
+
+
+async def _batch_for_listing(db: AsyncSession, current: User, batch_id: uuid.UUID) -> Batch:
+    _assert_owner_or_admin(current)
+
+    # ── fetch batch first (authorisation) ──────────────────────
+    batch = await db.get(Batch, batch_id)
+    if not batch:
+        raise HTTPException(404, detail="Batch not found")
+
+    _company_guard(current, batch.company_id)  # raises if forbidden
+    return batch
+
+
 @router.get(
     "/batch/{batch_id}/records",
     response_model=list[CollabCardRead],
-    summary="All records inside one batch",
+    summary="Records inside one batch, a page at a time",
 )
 async def list_collabcards_in_batch(
     batch_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    cursor: str | None = Query(None, description="`X-Next-Cursor` of the previous page"),
+    limit: int = Query(RECORDS_PAGE, ge=1, le=RECORDS_PAGE_MAX),
     db: AsyncSession = Depends(get_db),
     current: User = Depends(get_current_user),
 ):
     """
     url: /collabcards/batch/{batch_id}/records
-    purpose: Returns all CollabCard rows inside the batch.
+    purpose: Returns the CollabCard rows inside the batch, oldest first.
     who can: Owner / Administrator of the batch’s company, or any global owner / admin.
 
-    Fetches **every** `CollabCard` that belongs to `batch_id`.
+    Keyset-paginated on `(created_at, id)`: while more rows follow, the
+    response carries `X-Next-Cursor` (and a `Link: rel="next"`); pass it
+    back as `cursor` for the next page. Every page costs the same however
+    deep it is, and rows added meanwhile are neither skipped nor repeated.
+    For a whole batch in one response see `records.ndjson`.
+    """
+    await _batch_for_listing(db, current, batch_id)
+
+    # ── fetch one page (+1 row to know whether another follows) ─
+    stmt = (
+        select(CollabCard)
+        .where(CollabCard.batch_id == batch_id)
+        .order_by(CollabCard.created_at, CollabCard.id)
+        .limit(limit + 1)
+    )
+    if cursor:
+        stmt = stmt.where(
+            tuple_(CollabCard.created_at, CollabCard.id) > tuple_(*_decode_cursor(cursor))
+        )
+    records = (await db.execute(stmt)).scalars().all()
+
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = _encode_cursor(records[-1])
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = (
+            f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+        )
+    return records
+
+
+async def _ndjson_records(batch_id: uuid.UUID) -> AsyncIterator[bytes]:
+    # its own session: the request's one is closed once the response starts
+    cols = CollabCard.__table__.c
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            select(*(cols[f] for f in CollabCardRead.model_fields))
+            .where(cols.batch_id == batch_id)
+            .order_by(cols.created_at, cols.id)
+            .execution_options(yield_per=RECORDS_STREAM_CHUNK)
+        )
+        async for rows in result.mappings().partitions():
+            # rows come from the database: serialise them without re-validating
+            yield b"".join(
+                CollabCardRead.model_construct(**row).model_dump_json().encode() + b"\n"
+                for row in rows
+            )
+
+
+@router.get(
+    "/batch/{batch_id}/records.ndjson",
+    response_class=StreamingResponse,
+    summary="Every record inside one batch, one JSON object per line",
+)
+async def stream_collabcards_in_batch(
+    batch_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    """
+    url: /collabcards/batch/{batch_id}/records.ndjson
+    purpose: The whole batch in one response, for exports and scripts.
+    who can: Owner / Administrator of the batch’s company, or any global owner / admin.
 
-    Access is restricted to owners / administrators
-    (global or company-scoped).
+    Same rows and order as `records`, streamed as `application/x-ndjson`
+    from a server-side cursor ``RECORDS_STREAM_CHUNK`` rows at a time, so
+    memory stays flat whatever the batch size.
+    """
+    await _batch_for_listing(db, current, batch_id)
+    return StreamingResponse(_ndjson_records(batch_id), media_type="application/x-ndjson")
+
+
+# ────────────────────────────────────────────────
+# 7. Rows dropped during ingest
+# ────────────────────────────────────────────────
+@router.get(
+    "/batch/{batch_id}/rejections",
+    response_model=RejectionPage,
+    summary="Rows the ingest skipped, with reasons",
+)
+async def list_batch_rejections(
+    batch_id: uuid.UUID,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    """
+    url: /collabcards/batch/{batch_id}/rejections
+    purpose: Explain rows of the uploaded file that did not become records.
+    who can: Owner / Administrator of the batch’s company, or any global owner / admin.
+
+    Pages through the rejection report written by the ingest (sheet, row
+    number as shown in the spreadsheet, reason, missing fields). Batches
+    created before reports existed, or not from a file, return an empty page.
     """
     _assert_owner_or_admin(current)
 
-    # ── fetch batch first (authorisation) ──────────────────────
-    batch: Batch | None = (
-        await db.execute(select(Batch).where(Batch.id == batch_id))
-    ).scalar_one_or_none()
+    batch = await db.get(Batch, batch_id)
     if not batch:
         raise HTTPException(404, detail="Batch not found")
 
     _company_guard(current, batch.company_id)  # raises if forbidden
 
-    # ── fetch records ─────────────────────────────────────────
-    res = await db.execute(
-        select(CollabCard)
-        .where(CollabCard.batch_id == batch_id)
-        .order_by(CollabCard.created_at.asc())
+    report = _batch_dir(batch.company_id, batch.id) / REJECTIONS_FILE
+    if not report.exists():
+        return RejectionPage(total=0, offset=offset, limit=limit, counts={}, items=[])
+
+    header, total, items = read_rejections(report, offset, limit)
+    return RejectionPage(
+        total=total,
+        offset=offset,
+        limit=limit,
+        counts=header.get("counts", {}),
+        items=list(items),
+    )
+
+
+# ────────────────────────────────────────────────
+# 8. Per-status summary (dashboard polling)
+# ────────────────────────────────────────────────
+@router.get(
+    "/batch/{batch_id}/summary",
+    response_model=BatchSummary,
+    summary="Record counts per status and card bytes of one batch",
+    responses={304: {"description": "Unchanged since the `ETag` sent"}},
+)
+async def get_batch_summary(
+    batch_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    """
+    url: /collabcards/batch/{batch_id}/summary
+    purpose: Progress of a batch without downloading its records.
+    who can: Owner / Administrator of the batch’s company, or any global owner / admin.
+
+    Counts come from one `GROUP BY status`, cached per process until the
+    batch's `updated_at` moves (see `services.summary`), so repeated polls
+    cost the batch lookup. The `ETag` is that version too: send it back as
+    `If-None-Match` and an unchanged batch answers 304 with no body.
+    """
+    batch = await _batch_for_listing(db, current, batch_id)
+
+    etag = f'"{batch.id.hex}-{int(batch.updated_at.timestamp() * 1_000_000):x}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    counts = await batch_counts(db, batch)
+    return BatchSummary(
+        batch_id=batch.id,
+        status=batch.status,
+        total_records=batch.total_records,
+        processed_records=batch.processed_records,
+        counts=counts.counts,
+        card_bytes=counts.card_bytes,
+        unmeasured_cards=counts.unmeasured,
+        updated_at=batch.updated_at,
     )
-    return res.scalars().all()
@@ -0,0 +1,286 @@
+# backend/app/api/endpoints/uploads.py
+"""
+Resumable uploads, modelled on the tus 1.0 core protocol.
+
+    POST   /uploads                 → create a session (201, Location, Upload-Offset: 0)
+    HEAD   /uploads/{id}            → Upload-Offset / Upload-Length
+    PATCH  /uploads/{id}            → append bytes at Upload-Offset
+    POST   /uploads/{id}/finalize   → hand the file to the XLSX, card or card-archive pipeline
+    DELETE /uploads/{id}            → abandon
+
+Partial data lives under ``<upload_dir>/partial/<id>/`` next to a small JSON
+sidecar; the received size on disk *is* the offset, so an interrupted PATCH
+simply resumes from whatever made it to disk. Sessions left to expire are
+removed by the worker's ``cards.collect_uploads`` beat task.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import fcntl
+import json
+import shutil
+import uuid
+from pathlib import Path
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
+
+from app.api.dependencies import get_current_user, get_db
+from app.api.endpoints import cards, collab_cards
+from app.api.spool import hash_file, run_io
+from app.core.config import get_settings
+from app.models import Batch, User
+from app.schemas.batch import BatchRead
+from app.schemas.upload import UploadCreate, UploadKind, UploadRead
+from app.services.upload_sessions import PARTIAL_ROOT
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+settings = get_settings()
+
+TUS_VERSION = {"Tus-Resumable": "1.0.0"}
+
+
+# ──────────────────────────────────────────────────────────────
+# session helpers
+# ──────────────────────────────────────────────────────────────
+def _paths(upload_id: uuid.UUID) -> tuple[Path, Path, Path]:
+    root = PARTIAL_ROOT / str(upload_id)
+    return root, root / "meta.json", root / "data"
+
+
+def _write_meta(meta_path: Path, meta: dict) -> None:
+    tmp = meta_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(meta))
+    tmp.replace(meta_path)
+
+
+def _read_meta(meta_path: Path) -> dict:
+    return json.loads(meta_path.read_text())
+
+
+def _remove(root: Path) -> None:
+    shutil.rmtree(root, ignore_errors=True)
+
+
+async def _load(upload_id: uuid.UUID, current: User) -> tuple[dict, Path, Path]:
+    """Return (meta, meta_path, data_path); 404 for unknown / foreign / expired."""
+    root, meta_path, data_path = _paths(upload_id)
+    try:
+        meta = await run_io(_read_meta, meta_path)
+    except (FileNotFoundError, ValueError):
+        raise HTTPException(404, detail="Upload not found")
+
+    if meta["owner_id"] != str(current.id):
+        raise HTTPException(404, detail="Upload not found")
+
+    if dt.datetime.fromisoformat(meta["expires_at"]) < dt.datetime.utcnow():
+        await run_io(_remove, root)
+        raise HTTPException(404, detail="Upload expired")
+
+    return meta, meta_path, data_path
+
+
+def _read(meta: dict, data_path: Path) -> UploadRead:
+    return UploadRead(**meta, offset=data_path.stat().st_size)
+
+
+def _offset_headers(meta: dict, offset: int) -> dict:
+    return {
+        **TUS_VERSION,
+        "Upload-Offset": str(offset),
+        "Upload-Length": str(meta["length"]),
+        "Cache-Control": "no-store",
+    }
+
+
+# ──────────────────────────────────────────────────────────────
+# 1. create
+# ──────────────────────────────────────────────────────────────
+@router.post("/", response_model=UploadRead, status_code=status.HTTP_201_CREATED)
+async def create_upload(
+    body: UploadCreate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    if body.length > settings.resumable_max_bytes:
+        raise HTTPException(413, detail=f"Uploads are limited to {settings.resumable_max_bytes} bytes")
+
+    company_id = body.company_id
+    if body.kind == UploadKind.xlsx:
+        collab_cards.xlsx_filename(body.filename)
+        company_id = collab_cards._company_guard(current, body.company_id)
+    else:
+        if body.batch_id is None:
+            raise HTTPException(400, detail="batch_id is required for card uploads")
+        if body.kind == UploadKind.archive:
+            if not body.filename.lower().endswith(".zip"):
+                raise HTTPException(400, detail="Card archives must be .zip files")
+        elif cards._record_id(body.filename) is None:
+            raise HTTPException(400, detail="Card file must be named <record-uuid>.png")
+        batch = await db.get(Batch, body.batch_id)
+        if not batch:
+            raise HTTPException(404, detail="Batch not found")
+        cards._company_guard(current, batch)
+        company_id = batch.company_id
+
+    upload_id = uuid.uuid4()
+    root, meta_path, data_path = _paths(upload_id)
+    root.mkdir(parents=True)
+    data_path.touch()
+
+    now = dt.datetime.utcnow()
+    meta = {
+        **body.model_dump(mode="json"),
+        "company_id": str(company_id) if company_id else None,
+        "id": str(upload_id),
+        "owner_id": str(current.id),
+        "created_at": now.isoformat(),
+        "expires_at": (now + dt.timedelta(hours=settings.resumable_ttl_hours)).isoformat(),
+    }
+    await run_io(_write_meta, meta_path, meta)
+
+    response.headers.update(_offset_headers(meta, 0))
+    response.headers["Location"] = str(request.url_for("get_upload", upload_id=upload_id))
+    return _read(meta, data_path)
+
+
+# ──────────────────────────────────────────────────────────────
+# 2. inspect
+# ──────────────────────────────────────────────────────────────
+@router.head("/{upload_id}")
+async def head_upload(upload_id: uuid.UUID, current: User = Depends(get_current_user)):
+    meta, _, data_path = await _load(upload_id, current)
+    return Response(headers=_offset_headers(meta, data_path.stat().st_size))
+
+
+@router.get("/{upload_id}", response_model=UploadRead)
+async def get_upload(upload_id: uuid.UUID, current: User = Depends(get_current_user)):
+    meta, _, data_path = await _load(upload_id, current)
+    return _read(meta, data_path)
+
+
+# ──────────────────────────────────────────────────────────────
+# 3. append
+# ──────────────────────────────────────────────────────────────
+@router.patch("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def append_upload(
+    upload_id: uuid.UUID,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    current: User = Depends(get_current_user),
+):
+    meta, meta_path, data_path = await _load(upload_id, current)
+    length = meta["length"]
+
+    with data_path.open("r+b") as out:
+        try:
+            # one writer per session, across uvicorn workers too
+            fcntl.flock(out, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise HTTPException(409, detail="Another request is writing to this upload")
+
+        offset = out.seek(0, 2)
+        if upload_offset != offset:
+            raise HTTPException(
+                409,
+                detail=f"Upload-Offset {upload_offset} does not match {offset}",
+                headers=_offset_headers(meta, offset),
+            )
+
+        try:
+            async for chunk in request.stream():
+                if offset + len(chunk) > length:
+                    await run_io(out.write, chunk[: length - offset])
+                    raise HTTPException(413, detail="More data than the declared length")
+                await run_io(out.write, chunk)
+                offset += len(chunk)
+        except ClientDisconnect:
+            pass  # keep what arrived; the client resumes from HEAD's offset
+        finally:
+            await run_io(out.flush)
+
+    # sliding expiry: sessions only die when nobody is feeding them
+    meta["expires_at"] = (
+        dt.datetime.utcnow() + dt.timedelta(hours=settings.resumable_ttl_hours)
+    ).isoformat()
+    await run_io(_write_meta, meta_path, meta)
+
+    return Response(status_code=204, headers=_offset_headers(meta, offset))
+
+
+# ──────────────────────────────────────────────────────────────
+# 4. finalize / abandon
+# ──────────────────────────────────────────────────────────────
+@router.post("/{upload_id}/finalize", response_model=BatchRead)
+async def finalize_upload(
+    upload_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    meta, _, data_path = await _load(upload_id, current)
+    root = data_path.parent
+    offset = data_path.stat().st_size
+    if offset != meta["length"]:
+        raise HTTPException(
+            409,
+            detail=f"Upload incomplete: {offset} of {meta['length']} bytes",
+            headers=_offset_headers(meta, offset),
+        )
+
+    company_id = uuid.UUID(meta["company_id"]) if meta["company_id"] else None
+
+    if meta["kind"] == UploadKind.xlsx:
+        batch, dest_path = collab_cards.new_xlsx_batch(current, company_id, meta["filename"])
+        data_path.replace(dest_path)
+        digest = await run_io(hash_file, dest_path)
+        result = await collab_cards.queue_xlsx_batch(
+            db,
+            background_tasks,
+            current=current,
+            batch=batch,
+            dest_path=dest_path,
+            digest=digest,
+            sheets=meta["sheets"],
+            clone=meta["clone"],
+        )
+    else:
+        batch = await db.get(Batch, uuid.UUID(meta["batch_id"]))
+        if not batch:
+            raise HTTPException(404, detail="Batch not found")
+        cards._company_guard(current, batch)
+        finalize = (
+            cards.finalize_archive_upload
+            if meta["kind"] == UploadKind.archive
+            else cards.finalize_card_upload
+        )
+        result = await finalize(
+            db,
+            background_tasks,
+            current=current,
+            batch=batch,
+            filename=meta["filename"],
+            src_path=data_path,
+        )
+
+    await run_io(_remove, root)
+    return result
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_upload(upload_id: uuid.UUID, current: User = Depends(get_current_user)):
+    meta, _, data_path = await _load(upload_id, current)
+    await run_io(_remove, data_path.parent)
+    return Response(status_code=204, headers=TUS_VERSION)
@@ -7,6 +7,7 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user, require_global_owner, get_db
+from app.api.user_cache import user_cache
 from app.models.company import Company
 from app.models.user import User, Role
 from app.schemas.user import UserCreate, UserRead, UserUpdate
@@ -115,6 +116,14 @@ async def create_user(
     return user
 
 
+@router.get(
+    "/cache-stats",
+    summary="Hit / miss counters of this process's user cache (global owners only)",
+)
+async def user_cache_stats(_: None = Depends(require_global_owner)) -> dict[str, int]:
+    return user_cache.stats()
+
+
 @router.get(
     "/{user_id}",
     response_model=UserRead,
@@ -167,11 +176,14 @@ async def update_user(
             )
 
     # 5️⃣ Apply only provided fields
+    old_email = user.email
     for field, val in data.items():
         setattr(user, field, val)
 
-    # 6️⃣ Persist
+    # 6️⃣ Persist; tokens resolve through the user cache, so drop the entry
+    #    (both e-mails: a token for the old one must stop resolving too)
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    await user_cache.invalidate(old_email, user.email)
     return user
\ No newline at end of file
@@ -0,0 +1,89 @@
+# backend/app/api/files.py
+"""
+Conditional and partial responses for files on disk.
+
+:func:`file_response` answers ``If-None-Match`` with 304, a single
+``Range`` with 206 (see :mod:`app.api.ranges`) and everything else with a
+:class:`FileResponse`, which hands the path to the server when it supports
+the ASGI ``pathsend`` extension (zero-copy) and streams it otherwise.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import anyio
+from fastapi import Request
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.api.ranges import byte_range
+
+READ_CHUNK = 256 * 1024
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` check; weak comparison, as RFC 9110 §13.1.2 asks."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (t.strip().removeprefix("W/") for t in if_none_match.split(","))
+    return etag.removeprefix("W/") in tags
+
+
+class _FileSlice(FileResponse):
+    """``FileResponse`` for bytes ``[start, stop)`` of the file (a 206 body)."""
+
+    def __init__(self, path: Path, start: int, stop: int, **kwargs) -> None:
+        super().__init__(path, status_code=206, **kwargs)
+        self.start, self.stop = start, stop
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            left = self.stop - self.start
+            while left > 0:
+                chunk = await file.read(min(READ_CHUNK, left))
+                if not chunk:
+                    break  # truncated underneath us; the client sees a short body
+                left -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": left > 0})
+        if left > 0:
+            await send({"type": "http.response.body", "body": b""})
+
+
+def file_response(
+    request: Request,
+    path: Path,
+    st: os.stat_result,
+    *,
+    etag: str,
+    cache_control: str,
+    media_type: str,
+) -> Response:
+    """
+    Serve *path* (already ``stat``-ed as *st*) with a strong *etag* and
+    *cache_control*, honouring ``If-None-Match``, ``Range`` and ``If-Range``.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Accept-Ranges": "bytes"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    requested = byte_range(
+        request.headers.get("range"), request.headers.get("if-range"), st.st_size, etag
+    )
+    if requested is None:
+        return FileResponse(
+            path, headers=headers, media_type=media_type, stat_result=st,
+            content_disposition_type="inline",
+        )
+
+    start, stop = requested
+    headers["Content-Range"] = f"bytes {start}-{stop - 1}/{st.st_size}"
+    headers["Content-Length"] = str(stop - start)
+    return _FileSlice(path, start, stop, headers=headers, media_type=media_type, stat_result=st)
@@ -0,0 +1,45 @@
+# backend/app/api/ranges.py
+"""
+Single byte-range requests (RFC 9110 §14) for download endpoints.
+
+Only ``bytes=a-b``, ``bytes=a-`` and ``bytes=-n`` are honoured; anything
+else (other units, several ranges, garbage) falls back to the full body,
+which the RFC allows. ``If-Range`` is compared against the strong ETag only.
+"""
+from __future__ import annotations
+
+from fastapi import HTTPException
+
+
+def byte_range(
+    range_header: str | None, if_range: str | None, size: int, etag: str
+) -> tuple[int, int] | None:
+    """
+    ``(start, stop)`` to answer with 206, or None to send the whole
+    representation. Raises 416 for a range that lies entirely past the end.
+    """
+    if not range_header:
+        return None
+    if if_range is not None and if_range.strip() != etag:
+        return None  # the client's copy is stale: start over
+
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            stop = int(last) + 1 if last else size
+            if last and stop <= start:
+                return None  # bytes=5-3: invalid, so ignored
+        else:  # suffix range: the last N bytes
+            n = int(last)
+            start, stop = (max(size - n, 0), size) if n > 0 else (size, size)
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise HTTPException(416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, min(stop, size)
@@ -0,0 +1,88 @@
+# backend/app/api/spool.py
+"""
+Disk I/O for upload endpoints, off the event loop.
+
+Every blocking read, write, hash or rename an endpoint needs goes through
+:func:`run_io`, a worker thread drawn from one ``CapacityLimiter`` of
+``settings.spool_threads``. A burst of uploads then queues for those
+threads instead of stalling the loop (and every unrelated request with it),
+and cannot starve the default pool that sync endpoints and Starlette's
+``UploadFile`` use either.
+
+A file is copied in one thread hop, not one per chunk; hashlib drops the
+GIL on large buffers, so hashing while copying runs in parallel too.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, List, TypeVar
+
+import anyio
+from fastapi import UploadFile
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+SPOOL_CHUNK = 1_048_576  # 1 MiB
+
+T = TypeVar("T")
+
+_limiter = anyio.CapacityLimiter(settings.spool_threads)
+
+
+@dataclass
+class Spooled:
+    path: Path
+    size: int
+    digest: "hashlib._Hash"  # sha256 of the bytes written
+
+
+async def run_io(func: Callable[..., T], *args) -> T:
+    """Run blocking *func* in the spool thread pool."""
+    return await anyio.to_thread.run_sync(partial(func, *args), limiter=_limiter)
+
+
+async def run_io_many(calls: Iterable[Callable[[], T]]) -> List[T]:
+    """Run several blocking calls concurrently (within the pool's bound); results in order."""
+    calls = list(calls)
+    results: List[T] = [None] * len(calls)  # type: ignore[list-item]
+
+    async def _one(i: int, call: Callable[[], T]) -> None:
+        results[i] = await run_io(call)
+
+    async with anyio.create_task_group() as tg:
+        for i, call in enumerate(calls):
+            tg.start_soon(_one, i, call)
+    return results
+
+
+def copy_to(src: BinaryIO, dest_path: Path, limit: int | None = None) -> Spooled:
+    """
+    Blocking: copy *src* to *dest_path* ``SPOOL_CHUNK`` at a time, hashing
+    it. Raises ValueError as soon as more than *limit* bytes arrive.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with dest_path.open("wb") as out:
+        for chunk in iter(lambda: src.read(SPOOL_CHUNK), b""):
+            size += len(chunk)
+            if limit is not None and size > limit:
+                raise ValueError(f"more than {limit} bytes")
+            digest.update(chunk)
+            out.write(chunk)
+    return Spooled(dest_path, size, digest)
+
+
+def hash_file(path: Path) -> "hashlib._Hash":
+    """Blocking: sha256 of a file already on disk."""
+    with path.open("rb") as fh:
+        return hashlib.file_digest(fh, "sha256")
+
+
+async def spool(file: UploadFile, dest_path: Path) -> Spooled:
+    """Save an uploaded file to *dest_path*, hashing it on the way."""
+    return await run_io(copy_to, file.file, dest_path)
@@ -0,0 +1,218 @@
+# backend/app/api/user_cache.py
+"""
+Resolved users by token subject, so authenticating a request rarely
+touches the database.
+
+Two tiers, both keyed by the token's subject (the e-mail):
+
+* per process: an LRU of ``settings.user_cache_size`` entries, each kept
+  ``settings.user_cache_ttl`` seconds;
+* optionally (``settings.user_cache_redis``) Redis, shared by every API
+  process, for ``settings.user_cache_redis_ttl`` seconds.
+
+A hit yields a transient ``User`` built from the cached columns, never
+``hashed_password``; endpoints only read it. :meth:`UserCache.invalidate`
+drops an entry from this process and from Redis, so a change made through
+the API applies at once where it was made, and everywhere else within the
+per-process TTL at the latest. Token validation itself is not cached:
+the JWT is still decoded (signature, expiry) on every request.
+
+A request that read the user before a change committed must not put the
+old row back afterwards. So :meth:`UserCache.invalidate` also bumps a
+per-user generation (a counter here, a random token under
+``user-gen:<subject>`` in Redis), and :meth:`UserCache.put` only stores
+what was read under the :meth:`UserCache.generation` that is still
+current; in Redis the check and the write are one WATCH/MULTI transaction.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import enum
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+import anyio
+import redis
+
+from app.core.config import get_settings
+from app.models.user import User
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "user:"
+REDIS_GEN_PREFIX = "user-gen:"
+REDIS_GEN_TTL = 24 * 3600  # an expired generation only ever makes a put fail, never pass
+REDIS_BACKOFF = 10.0  # after a Redis error, skip the shared tier this long
+
+_COLUMNS = [c for c in User.__table__.columns if c.key != "hashed_password"]
+
+
+def _to_json(values: dict[str, Any]) -> str:
+    def encode(v):
+        if isinstance(v, enum.Enum):
+            return v.value
+        if isinstance(v, dt.datetime):
+            return v.isoformat()
+        return str(v) if isinstance(v, uuid.UUID) else v
+
+    return json.dumps({k: encode(v) for k, v in values.items()})
+
+
+def _from_json(raw: str | bytes) -> dict[str, Any]:
+    data = json.loads(raw)
+    values = {}
+    for col in _COLUMNS:
+        v, py = data.get(col.key), col.type.python_type
+        values[col.key] = v if v is None else py.fromisoformat(v) if py is dt.datetime else py(v)
+    return values
+
+
+class Generation(NamedTuple):
+    """Where a subject's invalidations stood when its row was read."""
+
+    local: int
+    shared: str | None  # "" when Redis has none; None when Redis wasn't asked
+
+
+class UserCache:
+    def __init__(self, size: int, ttl: float, redis_url: str | None, redis_ttl: int) -> None:
+        self.size, self.ttl, self.redis_ttl = size, ttl, redis_ttl
+        self._local: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        # subject → number of the invalidation that last hit it; subjects not
+        # in it read as the count at the last clear, so clearing only ever
+        # makes a pending put fail
+        self._invalidated: dict[str, int] = {}
+        self._invalidations = self._cleared_at = 0
+        # sync client from a thread, like app.services.events: not tied to one event loop
+        self._redis = redis.Redis.from_url(
+            redis_url, socket_connect_timeout=1, socket_timeout=1
+        ) if redis_url else None
+        self._redis_quiet_until = 0.0
+        self.hits = self.redis_hits = self.misses = 0
+
+    # ── shared tier; any failure just skips it for a while ─────
+    def _redis_usable(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_quiet_until
+
+    def _redis_failed(self, action: str) -> None:
+        self._redis_quiet_until = time.monotonic() + REDIS_BACKOFF
+        logger.warning("user cache: Redis %s failed, using the database", action, exc_info=True)
+
+    # ── lookups ────────────────────────────────────────────────
+    async def get(self, subject: str) -> User | None:
+        """The cached user for *subject*, or None (counted as a miss)."""
+        entry = self._local.get(subject)
+        if entry is not None and entry[0] > time.monotonic():
+            self._local.move_to_end(subject)
+            self.hits += 1
+            return User(**entry[1])
+
+        if self._redis_usable():
+            try:
+                raw = await anyio.to_thread.run_sync(self._redis.get, REDIS_PREFIX + subject)
+            except (redis.RedisError, OSError):
+                self._redis_failed("get")
+                raw = None
+            if raw is not None:
+                values = _from_json(raw)
+                self._store(subject, values)
+                self.redis_hits += 1
+                return User(**values)
+
+        self.misses += 1
+        return None
+
+    async def generation(self, subject: str) -> Generation:
+        """Take this before reading *subject* from the database, for :meth:`put`."""
+        shared = None
+        if self._redis_usable():
+            try:
+                raw = await anyio.to_thread.run_sync(self._redis.get, REDIS_GEN_PREFIX + subject)
+                shared = raw.decode() if raw is not None else ""
+            except (redis.RedisError, OSError):
+                self._redis_failed("get")
+        return Generation(self._local_generation(subject), shared)
+
+    async def put(self, subject: str, user: User, generation: Generation) -> None:
+        """Cache *user*, unless *subject* was invalidated since *generation* was taken."""
+        if self._local_generation(subject) != generation.local:
+            return
+        values = {c.key: getattr(user, c.key) for c in _COLUMNS}
+        if generation.shared is not None and self._redis_usable():
+            try:
+                current = await anyio.to_thread.run_sync(
+                    self._put_shared, subject, _to_json(values), generation.shared
+                )
+            except (redis.RedisError, OSError):
+                self._redis_failed("set")
+            else:
+                if not current:
+                    return  # another process invalidated it: not here either
+        self._store(subject, values)
+
+    def _put_shared(self, subject: str, payload: str, shared: str) -> bool:
+        gen_key = REDIS_GEN_PREFIX + subject
+
+        def write(pipe: redis.client.Pipeline) -> bool:
+            current = pipe.get(gen_key)
+            if (current.decode() if current is not None else "") != shared:
+                return False  # invalidated meanwhile, by any process
+            pipe.multi()
+            pipe.set(REDIS_PREFIX + subject, payload, ex=self.redis_ttl)
+            return True
+
+        # retried if the generation changes before EXEC, then skipped by the check
+        return self._redis.transaction(write, gen_key, value_from_callable=True)
+
+    async def invalidate(self, *subjects: str) -> None:
+        """Forget *subjects* here and in Redis (call after the change is committed)."""
+        self._invalidations += 1
+        if len(self._invalidated) >= self.size:
+            self._invalidated.clear()
+            self._cleared_at = self._invalidations
+        for subject in subjects:
+            self._local.pop(subject, None)
+            self._invalidated[subject] = self._invalidations
+        if self._redis is not None and subjects:
+            try:
+                await anyio.to_thread.run_sync(self._invalidate_shared, subjects)
+            except (redis.RedisError, OSError):
+                self._redis_failed("delete")
+
+    def _local_generation(self, subject: str) -> int:
+        return self._invalidated.get(subject, self._cleared_at)
+
+    def _invalidate_shared(self, subjects: tuple[str, ...]) -> None:
+        pipe = self._redis.pipeline()
+        for subject in subjects:
+            # generation first: a put racing this DEL then fails its check
+            pipe.set(REDIS_GEN_PREFIX + subject, uuid.uuid4().hex, ex=REDIS_GEN_TTL)
+        pipe.delete(*(REDIS_PREFIX + s for s in subjects))
+        pipe.execute()
+
+    def _store(self, subject: str, values: dict[str, Any]) -> None:
+        self._local[subject] = (time.monotonic() + self.ttl, values)
+        self._local.move_to_end(subject)
+        while len(self._local) > self.size:
+            self._local.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "size": len(self._local),
+        }
+
+
+user_cache = UserCache(
+    settings.user_cache_size,
+    settings.user_cache_ttl,
+    settings.redis_url if settings.user_cache_redis else None,
+    settings.user_cache_redis_ttl,
+)
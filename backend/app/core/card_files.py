@@ -0,0 +1,30 @@
+# backend/app/core/card_files.py
+"""
+Names and URL versions of card files, shared by the response schemas and
+the card store. Pure functions only: importing this touches no disk and
+no settings.
+"""
+from __future__ import annotations
+
+import datetime as dt
+from pathlib import Path
+
+# preview next to each card: <uuid>.png → <uuid>.thumb.webp
+THUMB_SUFFIX = ".thumb.webp"
+
+
+def thumb_name(card_filename: str) -> str:
+    """Thumbnail path (relative to ``CARDS_ROOT``) for a ``card_filename``."""
+    stem, _, _ = card_filename.rpartition(".")
+    return (stem or card_filename) + THUMB_SUFFIX
+
+
+def thumb_path(card_path: Path) -> Path:
+    return card_path.with_name(card_path.stem + THUMB_SUFFIX)
+
+
+def card_version(card_sha256: str | None, generated_at: dt.datetime | None) -> str:
+    """``?v=`` for a card's URLs: its content hash, else (older cards) its time."""
+    if card_sha256:
+        return card_sha256[:16]
+    return str(int(generated_at.timestamp())) if generated_at else "0"
@@ -7,11 +7,32 @@ class Settings(BaseSettings):
     database_url: str = Field(..., env="DATABASE_URL")
     secret_key: str = Field(..., env="SECRET_KEY")
     access_token_expire_minutes: int = 60 * 24  # 1 day
+    query_token_expire_minutes: int = 15        # scoped ?access_token= tokens, see security.py
     upload_dir: str = Field(
         default=str(Path(__file__).parent.parent.parent / "uploads"),
         env="UPLOAD_DIR"
     )
 
+    # resumable uploads (app/api/endpoints/uploads.py)
+    resumable_max_bytes: int = 2 * 1024**3  # 2 GiB per upload
+    resumable_ttl_hours: int = 24           # idle sessions are discarded after this
+
+    # threads for upload disk I/O (app/api/spool.py), shared by all endpoints
+    spool_threads: int = 8
+
+    # batch progress events (app/services/events.py); the Celery broker's Redis will do
+    redis_url: str = Field(default="redis://redis:6379/0", env="REDIS_URL")
+
+    # authenticated-user cache (app/api/user_cache.py)
+    user_cache_size: int = 10_000
+    user_cache_ttl: int = 30           # seconds a process trusts its own entry
+    user_cache_redis: bool = False     # shared tier in redis_url
+    user_cache_redis_ttl: int = 300
+
+    # card rendering (app/services/render.py); unset → Pillow's bundled font
+    card_font_path: str | None = None
+    card_font_bold_path: str | None = None
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,4 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 from .config import get_settings
 
 settings = get_settings()
@@ -6,6 +7,12 @@ settings = get_settings()
 engine = create_async_engine(settings.database_url, echo=False)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+# Celery tasks drive each job through asyncio.run(), i.e. a fresh event loop
+# per job. asyncpg connections are bound to the loop that opened them, so the
+# worker must not keep a pool around between jobs.
+worker_engine = create_async_engine(settings.database_url, echo=False, poolclass=NullPool)
+WorkerSessionLocal = async_sessionmaker(worker_engine, expire_on_commit=False)
+
 
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
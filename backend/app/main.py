@@ -2,7 +2,6 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from .api import router as api_router
 from .core.config import get_settings
 
@@ -21,11 +20,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "ETag"],  # pagination, summary polling
 )
 
-app.include_router(api_router, prefix="/api")
-app.mount(
-    "/static/cards",
-    StaticFiles(directory=f"{settings.upload_dir}/cards"),  # Use f-string
-    name="cards"
-)
\ No newline at end of file
+# card images are served by GET /api/cards/<company>/<batch>/<file>, which
+# checks the caller's company (app/api/endpoints/cards.py)
+app.include_router(api_router, prefix="/api")
\ No newline at end of file
@@ -1,5 +1,5 @@
 from uuid import UUID, uuid4
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import ForeignKey, Index, Integer, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.collabcard import CollabCard
@@ -10,6 +10,18 @@ from .enums import BatchStatus
 
 class Batch(Base, TimeStampMixin):
     __tablename__ = "batches"
+    __table_args__ = (
+        Index("ix_batches_company_id_created_at", "company_id", "created_at"),
+        # in-flight batches (/collabcards/pending-batches, same predicate)
+        Index(
+            "ix_batches_in_flight",
+            "company_id",
+            "created_at",
+            postgresql_where=text(
+                "status = 'processing' OR processed_records < total_records"
+            ),
+        ),
+    )
 
     id: Mapped[PK_UUID] = mapped_column(default=uuid4)
     company_id: Mapped[UUID | None] = mapped_column(ForeignKey("companies.id"))
@@ -18,8 +30,13 @@ class Batch(Base, TimeStampMixin):
     original_filename: Mapped[str | None] = mapped_column(nullable=True, index=True)
     total_records: Mapped[int] = mapped_column(Integer, default=0)
     processed_records: Mapped[int] = mapped_column(Integer, default=0)
+    # rows the parser dropped; details in the batch's rejections.bin
+    rejected_records: Mapped[int] = mapped_column(Integer, default=0)
     status: Mapped[BatchStatus] = mapped_column(default=BatchStatus.pending)
 
+    # sha256 of the uploaded spreadsheet (+ sheet selection) → dedup retries
+    content_sha256: Mapped[str | None] = mapped_column(nullable=True, index=True)
+
     # relationships
     records: Mapped[list["CollabCard"]] = relationship(
         back_populates="batch", cascade="all,delete-orphan"
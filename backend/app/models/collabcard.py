@@ -1,6 +1,6 @@
 from uuid import UUID, uuid4
 import datetime as dt
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, PK_UUID
@@ -10,6 +10,18 @@ from .enums import RecordStatus
 
 class CollabCard(Base, TimeStampMixin):
     __tablename__ = "collabcards"
+    __table_args__ = (
+        # record listing (keyset on created_at, id), upserts, counters
+        Index("ix_collabcards_batch_id_created_at_id", "batch_id", "created_at", "id"),
+        Index("ix_collabcards_company_id_created_at", "company_id", "created_at"),
+        # records still to render: the claim and progress updates skip the rest
+        Index(
+            "ix_collabcards_batch_id_unfinished",
+            "batch_id",
+            "status",
+            postgresql_where=text("status <> 'generated'"),
+        ),
+    )
 
     id: Mapped[PK_UUID] = mapped_column(default=uuid4)
     batch_id: Mapped[UUID] = mapped_column(ForeignKey("batches.id"))
@@ -22,10 +34,17 @@ class CollabCard(Base, TimeStampMixin):
     mobile_phone: Mapped[str | None]     # Celular
     job_title: Mapped[str | None]        # Puesto
     office_phone: Mapped[str | None]     # Teléfono Oficina
+    # services.ingest.row_hash of the columns above; lets re-uploads skip unchanged rows
+    row_hash: Mapped[str | None] = mapped_column(nullable=True)
 
     # generation/output
     status: Mapped[RecordStatus] = mapped_column(default=RecordStatus.pending)
     card_filename: Mapped[str | None] = mapped_column(nullable=True)
+    # content address of the card file (services.card_store.blob_path)
+    card_sha256: Mapped[str | None] = mapped_column(nullable=True, index=True)
+    # sizes before / after the optimize stage (tasks.optimize_cards); NULL until it ran
+    card_bytes_original: Mapped[int | None] = mapped_column(nullable=True)
+    card_bytes: Mapped[int | None] = mapped_column(nullable=True)
     generated_at: Mapped[dt.datetime | None] = mapped_column(nullable=True)
 
     batch: Mapped["Batch"] = relationship(back_populates="records")
@@ -21,7 +21,7 @@ class User(Base):
     hashed_password: Mapped[str]
     role: Mapped[Role] = mapped_column(default=Role.standard)
     is_active: Mapped[bool] = mapped_column(default=True)
-    company_id: Mapped[UUID | None] = mapped_column(ForeignKey("companies.id"), nullable=True)
+    company_id: Mapped[UUID | None] = mapped_column(ForeignKey("companies.id"), nullable=True, index=True)
 
     # Card fields (optional)
     card_full_name: Mapped[str | None]
@@ -12,8 +12,35 @@ class BatchRead(BatchBase):
     id: UUID
     total_records: int
     processed_records: int
+    rejected_records: int = 0
     status: BatchStatus
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class RejectedRow(BaseModel):
+    sheet: str | None
+    row: int
+    reason: str
+    missing: list[str] = []
+
+
+class RejectionPage(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    counts: dict[str, int]
+    items: list[RejectedRow]
+
+
+class BatchSummary(BaseModel):
+    batch_id: UUID
+    status: BatchStatus
+    total_records: int
+    processed_records: int
+    counts: dict[str, int]  # records per RecordStatus, every status present
+    card_bytes: int         # stored bytes of the generated cards measured so far
+    unmeasured_cards: int   # generated cards the optimize stage hasn't sized yet
+    updated_at: datetime
@@ -1,7 +1,8 @@
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, computed_field
 from app.models.enums import RecordStatus
+from app.core.card_files import card_version, thumb_name
 
 
 class CollabCardCreate(BaseModel):
@@ -16,7 +17,28 @@ class CollabCardRead(CollabCardCreate):
     id: UUID
     status: RecordStatus
     card_filename: str | None
+    card_sha256: str | None = None
+    card_bytes_original: int | None = None   # before / after the optimize stage
+    card_bytes: int | None = None
     generated_at: datetime | None
 
+    # both relative to the API root; ``?v=`` changes with the card's content,
+    # which lets GET /cards/… mark the response immutable
+
+    @computed_field
+    @property
+    def card_url(self) -> str | None:
+        if not self.card_filename:
+            return None
+        return f"/cards/{self.card_filename}?v={card_version(self.card_sha256, self.generated_at)}"
+
+    @computed_field
+    @property
+    def thumbnail_url(self) -> str | None:
+        if not self.card_filename:
+            return None
+        version = card_version(self.card_sha256, self.generated_at)
+        return f"/cards/{thumb_name(self.card_filename)}?v={version}"
+
     class Config:
         from_attributes = True
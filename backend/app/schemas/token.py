@@ -1,6 +1,13 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+
+
+class ScopedToken(Token):
+    """For ``?access_token=``: opens one batch's cards or one company's events."""
+    expires_at: datetime
@@ -0,0 +1,29 @@
+import enum
+from uuid import UUID
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class UploadKind(str, enum.Enum):
+    xlsx = "xlsx"        # collaborator spreadsheet → new batch
+    cards = "cards"      # one <record-uuid>.png for an existing batch
+    archive = "archive"  # a .zip of <record-uuid>.png cards for an existing batch
+
+
+class UploadCreate(BaseModel):
+    kind: UploadKind
+    filename: str
+    length: int = Field(..., gt=0, description="Total size in bytes")
+
+    company_id: UUID | None = None   # xlsx: target company (owners)
+    batch_id: UUID | None = None     # cards / archive: batch the cards belong to
+    sheets: List[str] | None = None  # xlsx: as for /collabcards/upload-xlsx
+    clone: bool = False              # xlsx: as for /collabcards/upload-xlsx
+
+
+class UploadRead(UploadCreate):
+    id: UUID
+    offset: int
+    created_at: datetime
+    expires_at: datetime
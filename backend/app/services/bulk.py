@@ -0,0 +1,423 @@
+# backend/app/services/bulk.py
+"""
+Bulk CollabCard writer.
+
+PostgreSQL + asyncpg gets ``COPY … FROM STDIN`` (``copy_records_to_table``);
+any other dialect falls back to a Core ``insert()`` executemany. Both paths
+bypass the ORM unit of work, so no ``CollabCard`` objects are ever built.
+
+:func:`upsert_into_batch` re-ingests a corrected file into an existing batch,
+matching rows by email and only touching those whose ``row_hash`` changed.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import uuid
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, List, Mapping, Union
+
+from sqlalchemy import bindparam, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Batch, CollabCard
+from app.models.enums import BatchStatus, RecordStatus
+from app.services.card_store import remove_cards
+from app.services.events import publish_batch
+from app.services.ingest import BATCH_SIZE, RECORD_FIELDS, row_hash
+from app.services.rejections import RejectionLog
+
+# a parsed row: field → value mapping, or a tuple in RECORD_FIELDS order
+Record = Union[Mapping, tuple]
+
+# column order used for COPY; everything else on the table is nullable
+COPY_COLUMNS = (
+    "id",
+    "batch_id",
+    "company_id",
+    "created_by",
+    *RECORD_FIELDS,
+    "row_hash",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+
+def _values(rec: Record) -> tuple:
+    return rec if isinstance(rec, tuple) else tuple(rec.get(f) for f in RECORD_FIELDS)
+
+
+def _uses_copy(db: AsyncSession) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "asyncpg"
+
+
+async def _copy_chunk(
+    db: AsyncSession,
+    chunk: List[Record],
+    *,
+    batch_id: uuid.UUID,
+    company_id: uuid.UUID | None,
+    created_by: uuid.UUID | None,
+) -> None:
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    pg = raw.driver_connection
+
+    # the asyncpg adapter opens its transaction lazily on the first statement;
+    # COPY goes straight to the driver, so make sure it lands inside that block
+    if not pg.is_in_transaction():
+        await conn.exec_driver_sql("SELECT 1")
+
+    now = dt.datetime.utcnow()
+    pending = RecordStatus.pending.value
+    await pg.copy_records_to_table(
+        CollabCard.__tablename__,
+        columns=COPY_COLUMNS,
+        records=[
+            (
+                uuid.uuid4(),
+                batch_id,
+                company_id,
+                created_by,
+                *values,
+                row_hash(values),
+                pending,
+                now,
+                now,
+            )
+            for values in map(_values, chunk)
+        ],
+    )
+
+
+async def _insert_chunk(
+    db: AsyncSession,
+    chunk: List[Record],
+    *,
+    batch_id: uuid.UUID,
+    company_id: uuid.UUID | None,
+    created_by: uuid.UUID | None,
+) -> None:
+    await db.execute(
+        insert(CollabCard.__table__),
+        [
+            {
+                "batch_id": batch_id,
+                "company_id": company_id,
+                "created_by": created_by,
+                **dict(zip(RECORD_FIELDS, values)),
+                "row_hash": row_hash(values),
+            }
+            for values in map(_values, chunk)
+        ],
+    )
+
+
+async def _chunks(
+    records: Iterable[Record] | AsyncIterable[Record], size: int
+) -> AsyncIterator[List[Record]]:
+    if isinstance(records, AsyncIterable):
+        chunk: List[Record] = []
+        async for rec in records:
+            chunk.append(rec)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+async def bulk_insert_collabcards(
+    db: AsyncSession,
+    records: Iterable[Record] | AsyncIterable[Record],
+    *,
+    batch_id: uuid.UUID,
+    company_id: uuid.UUID | None,
+    created_by: uuid.UUID | None,
+    chunk_size: int = BATCH_SIZE,
+    on_chunk: Callable[[int], Awaitable[None]] | None = None,
+) -> int:
+    """
+    Stream *records* (sync or async, see ``Record``) into ``collabcards``.
+
+    Rows are written ``chunk_size`` at a time inside the session's current
+    transaction; committing is left to the caller, except that *on_chunk*
+    (called with the running total after each chunk) may commit to publish
+    progress. Returns the number of rows written.
+    """
+    write = _copy_chunk if _uses_copy(db) else _insert_chunk
+    total = 0
+    async for chunk in _chunks(records, chunk_size):
+        await write(
+            db,
+            chunk,
+            batch_id=batch_id,
+            company_id=company_id,
+            created_by=created_by,
+        )
+        total += len(chunk)
+        if on_chunk is not None:
+            await on_chunk(total)
+    return total
+
+
+async def ingest_into_batch(
+    db: AsyncSession,
+    batch: Batch,
+    records: Iterable[Record] | AsyncIterable[Record],
+    rejections: RejectionLog | None = None,
+) -> int:
+    """
+    Fill *batch* from *records*, committing after every chunk.
+
+    Each chunk is written and committed before the next one is read, so peak
+    memory is one chunk whatever the file size, and ``processed_records``
+    tracks progress while ``status`` is ``processing``.
+
+    On any failure the rows already committed for the batch are deleted and
+    the batch is left as ``error`` with zero counts before the exception is
+    re-raised; a batch is therefore either fully ingested or empty.
+
+    *rejections*, if given, is the log the parser behind *records* reports
+    dropped rows to; it is saved and counted once the last chunk is in.
+    """
+
+    # read before any rollback expires *batch*
+    batch_id, company_id, created_by = batch.id, batch.company_id, batch.created_by
+
+    async def _progress(done: int) -> None:
+        batch.processed_records = done
+        await db.commit()
+        await publish_batch(db, batch_id)
+
+    try:
+        total = await bulk_insert_collabcards(
+            db,
+            records,
+            batch_id=batch_id,
+            company_id=company_id,
+            created_by=created_by,
+            on_chunk=_progress,
+        )
+    except Exception:
+        await db.rollback()
+        cols = CollabCard.__table__.c
+        # a card may have been uploaded for a row committed by an earlier chunk
+        deleted = await db.execute(
+            delete(CollabCard.__table__)
+            .where(cols.batch_id == batch_id)
+            .returning(cols.card_filename, cols.card_sha256)
+        )
+        cleared = [(name, sha) for name, sha in deleted if name]
+        batch.total_records = 0
+        batch.processed_records = 0
+        batch.rejected_records = 0
+        batch.status = BatchStatus.error
+        await db.commit()
+        remove_cards(cleared)
+        await publish_batch(db, batch_id)
+        raise
+
+    if rejections is not None:
+        rejections.save()
+        batch.rejected_records = len(rejections)
+
+    batch.total_records = total
+    batch.processed_records = 0
+    batch.status = BatchStatus.pending
+    await db.commit()
+    await publish_batch(db, batch_id)
+    return total
+
+
+async def clone_batch_records(db: AsyncSession, source: Batch, target: Batch) -> int:
+    """
+    Copy *source*'s record data into *target* as fresh ``pending`` rows.
+
+    Server-side ``INSERT … SELECT`` on PostgreSQL; elsewhere the rows take a
+    round trip through :func:`bulk_insert_collabcards`. Returns the row count.
+    """
+    cols = CollabCard.__table__.c
+    data = [cols[f] for f in RECORD_FIELDS]
+
+    if db.get_bind().dialect.name != "postgresql":
+        rows = (await db.execute(select(*data).where(cols.batch_id == source.id))).all()
+        return await bulk_insert_collabcards(
+            db,
+            (tuple(r) for r in rows),
+            batch_id=target.id,
+            company_id=target.company_id,
+            created_by=target.created_by,
+        )
+
+    now = dt.datetime.utcnow()
+    result = await db.execute(
+        insert(CollabCard.__table__).from_select(
+            ["id", "batch_id", "company_id", "created_by", *RECORD_FIELDS,
+             "row_hash", "status", "created_at", "updated_at"],
+            select(
+                func.gen_random_uuid(),
+                literal(target.id, cols.batch_id.type),
+                literal(target.company_id, cols.company_id.type),
+                literal(target.created_by, cols.created_by.type),
+                *data,
+                cols.row_hash,
+                literal(RecordStatus.pending, cols.status.type),
+                literal(now),
+                literal(now),
+            ).where(cols.batch_id == source.id),
+        )
+    )
+    return result.rowcount
+
+
+_EMAIL_IX = RECORD_FIELDS.index("email")
+
+
+def _email_key(values: tuple) -> str:
+    return (values[_EMAIL_IX] or "").strip().lower()
+
+
+async def _refresh_counters(db: AsyncSession, batch: Batch, batch_id: uuid.UUID) -> None:
+    """Recount total / generated rows, with the status rule the card upload uses."""
+    cols = CollabCard.__table__.c
+    total, generated = (
+        await db.execute(
+            select(
+                func.count(),
+                func.count().filter(cols.status == RecordStatus.generated),
+            ).where(cols.batch_id == batch_id)
+        )
+    ).one()
+    batch.total_records = total
+    batch.processed_records = generated
+    batch.updated_at = dt.datetime.utcnow()  # records changed even if the counts didn't
+    if generated == 0:
+        batch.status = BatchStatus.pending
+    elif generated == total:
+        batch.status = BatchStatus.completed
+    else:
+        batch.status = BatchStatus.processing
+
+
+async def upsert_into_batch(
+    db: AsyncSession,
+    batch: Batch,
+    records: Iterable[Record] | AsyncIterable[Record],
+    rejections: RejectionLog | None = None,
+    content_sha256: str | None = None,
+) -> dict[str, int]:
+    """
+    Merge a corrected file into *batch*; the update-mode counterpart of
+    :func:`ingest_into_batch`.
+
+    Each record is matched to an existing row of the batch by email
+    (case-insensitive; a second row with the same email counts as new):
+
+    * no match → inserted as ``pending``;
+    * same ``row_hash`` → left alone, card and all;
+    * different hash → data overwritten, card cleared, back to ``pending``;
+      the cleared card's file and preview are removed after the commit.
+
+    Rows missing from the file are kept. Only ``(id, email, row_hash)`` and
+    the card columns per existing row are held in memory; the file is still
+    read a chunk at a time. Everything runs in one transaction, so a failure
+    leaves the batch as it was (counters recomputed, status never
+    ``error``). *content_sha256*, the merged file's hash, is stored on the
+    batch with the merged rows, so only a merge that went through makes the
+    same file a no-op next time. Returns ``{"inserted", "updated",
+    "unchanged"}`` counts.
+    """
+    # read before any rollback expires *batch*
+    batch_id, company_id, created_by = batch.id, batch.company_id, batch.created_by
+    cols = CollabCard.__table__.c
+
+    # data columns too: rows written before row_hash existed have to be hashed here
+    existing: dict[str, tuple[uuid.UUID, str, str | None, str | None]] = {}
+    result = await db.execute(
+        select(
+            cols.id,
+            cols.row_hash,
+            cols.card_filename,
+            cols.card_sha256,
+            *(cols[f] for f in RECORD_FIELDS),
+        )
+        .where(cols.batch_id == batch_id)
+        .order_by(cols.created_at)
+    )
+    for rec_id, digest, card_filename, card_sha256, *values in result:
+        existing.setdefault(
+            _email_key(tuple(values)),
+            (rec_id, digest or row_hash(values), card_filename, card_sha256),
+        )
+
+    write = _copy_chunk if _uses_copy(db) else _insert_chunk
+    stmt = (
+        update(CollabCard.__table__)
+        .where(cols.id == bindparam("b_id"))
+        .values(
+            status=RecordStatus.pending,
+            card_filename=None,
+            card_sha256=None,
+            card_bytes_original=None,
+            card_bytes=None,
+            generated_at=None,
+        )
+    )
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    cleared: List[tuple[str, str | None]] = []  # (card_filename, card_sha256) of updated rows
+
+    try:
+        async for chunk in _chunks(records, BATCH_SIZE):
+            inserts: List[tuple] = []
+            updates: List[dict] = []
+            for values in map(_values, chunk):
+                digest = row_hash(values)
+                match = existing.pop(_email_key(values), None)
+                if match is None:
+                    inserts.append(values)
+                elif match[1] == digest:
+                    counts["unchanged"] += 1
+                else:
+                    updates.append(
+                        {"b_id": match[0], **dict(zip(RECORD_FIELDS, values)), "row_hash": digest}
+                    )
+                    if match[2]:
+                        cleared.append((match[2], match[3]))
+
+            if inserts:
+                await write(
+                    db,
+                    inserts,
+                    batch_id=batch_id,
+                    company_id=company_id,
+                    created_by=created_by,
+                )
+            if updates:
+                await db.execute(stmt, updates)
+            counts["inserted"] += len(inserts)
+            counts["updated"] += len(updates)
+    except Exception:
+        await db.rollback()
+        await _refresh_counters(db, batch, batch_id)
+        await db.commit()
+        await publish_batch(db, batch_id)
+        raise
+
+    if rejections is not None:
+        rejections.save()
+        batch.rejected_records = len(rejections)
+    if content_sha256 is not None:
+        batch.content_sha256 = content_sha256
+
+    await _refresh_counters(db, batch, batch_id)
+    await db.commit()
+    remove_cards(cleared)
+    await publish_batch(db, batch_id)
+    return counts
@@ -0,0 +1,263 @@
+# backend/app/services/card_store.py
+"""
+Where rendered cards live and how records are pointed at them.
+
+Shared by the card upload endpoints and the render worker, so an uploaded
+PNG and a server-rendered one end up in the same place with the same
+bookkeeping: ``CARDS_ROOT/<company|global>/<batch>/<uuid>.png``, then
+``card_filename`` / ``generated_at`` and the batch's progress counters.
+
+The bytes themselves are stored once per content, in ``BLOBS_ROOT`` under
+their SHA-256; each per-record path is a hardlink to its blob. The link
+count is the reference count: re-rendering or re-uploading identical cards
+adds links, not data, and :func:`collect_blobs` removes blobs that no card
+path points at any more. Card files must therefore never be written in
+place, only replaced by rename (everything here does that).
+"""
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, List, NamedTuple
+
+from sqlalchemy import bindparam, case, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.card_files import thumb_path
+from app.core.config import get_settings
+from app.models import Batch, CollabCard
+from app.models.enums import BatchStatus, RecordStatus
+from app.services.summary import touch_batch
+
+settings = get_settings()
+
+CARDS_ROOT = Path(settings.upload_dir or "/data/uploads").joinpath("cards")
+CARDS_ROOT.mkdir(parents=True, exist_ok=True)
+
+LOOKUP_CHUNK = 1_000  # ids per IN (…) query; well under asyncpg's 32767 bind params
+
+# one file per distinct card: <sha[:2]>/<sha>.png; same volume as CARDS_ROOT
+BLOBS_ROOT = Path(settings.upload_dir or "/data/uploads").joinpath("blobs")
+BLOBS_ROOT.mkdir(parents=True, exist_ok=True)
+BLOB_GRACE_SECONDS = 3_600  # unreferenced blobs younger than this are kept
+
+
+class StoredCard(NamedTuple):
+    path: Path      # the record's card path, a hardlink to the blob
+    sha256: str
+
+
+def card_dest_dir(batch: Batch) -> Path:
+    """/data/uploads/cards/<company|global>/<batch>/ (created on demand)."""
+    dest_dir = (
+        CARDS_ROOT
+        / (str(batch.company_id) if batch.company_id else "global")
+        / str(batch.id)
+    )
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    return dest_dir
+
+
+# ──────────────────────────────────────────────────────────────
+# content-addressed blobs
+# ──────────────────────────────────────────────────────────────
+def blob_path(sha256: str) -> Path:
+    return BLOBS_ROOT / sha256[:2] / f"{sha256}.png"
+
+
+def temp_path(dest_path: Path, suffix: str = ".part") -> Path:
+    """Scratch name next to *dest_path*, unique per call, so concurrent writers never share one."""
+    return dest_path.with_name(f"{dest_path.name}.{uuid.uuid4().hex}{suffix}")
+
+
+def _link_card(sha256: str, dest_path: Path, src: Path | None) -> None:
+    """
+    Make *dest_path* a link to the blob, creating the blob from *src* (a
+    finished file on the same volume) if these bytes are new. A blob can be
+    collected between "it exists" and linking to it, hence the retry.
+    """
+    blob = blob_path(sha256)
+    blob.parent.mkdir(exist_ok=True)
+    for _ in range(3):
+        if src is not None:
+            try:
+                os.link(src, blob)
+            except FileExistsError:
+                pass  # known content (perhaps stored concurrently): the caller drops src
+        tmp = temp_path(dest_path, ".link")
+        try:
+            if dest_path.exists() and os.path.samefile(blob, dest_path):
+                return  # already this card
+            os.link(blob, tmp)
+        except (FileNotFoundError, FileExistsError):
+            continue
+        tmp.replace(dest_path)  # atomic: readers see the old card or the new one
+        # rename() is a no-op when a concurrent writer already linked the same blob
+        tmp.unlink(missing_ok=True)
+        return
+    raise FileNotFoundError(f"blob {sha256} disappeared while linking {dest_path}")
+
+
+def store_card(src: Path, dest_path: Path, sha256: str | None = None) -> StoredCard:
+    """
+    Put the finished card file *src* in the blob store and point *dest_path*
+    at it; *src* is consumed (it may be *dest_path* itself). Pass *sha256*
+    when it was computed while writing *src*, to skip reading it again.
+    """
+    if sha256 is None:
+        with src.open("rb") as fh:
+            sha256 = hashlib.file_digest(fh, "sha256").hexdigest()
+    _link_card(sha256, dest_path, src)
+    if src != dest_path:
+        src.unlink(missing_ok=True)
+    return StoredCard(dest_path, sha256)
+
+
+def store_card_bytes(data: bytes, dest_path: Path) -> StoredCard:
+    """:func:`store_card` for an encoded card in memory; known bytes aren't written again."""
+    sha256 = hashlib.sha256(data).hexdigest()
+    if blob_path(sha256).exists():
+        try:
+            _link_card(sha256, dest_path, None)
+            return StoredCard(dest_path, sha256)
+        except FileNotFoundError:
+            pass  # collected just now: write it after all
+    tmp = temp_path(dest_path)
+    tmp.write_bytes(data)
+    return store_card(tmp, dest_path, sha256)
+
+
+def remove_cards(cards: Iterable[tuple[str, str | None]]) -> int:
+    """
+    Unlink the card paths of records whose card was cleared, with their
+    previews, so that blobs no record uses any more become collectable.
+    *cards* holds ``(card_filename, card_sha256)`` as they were before the
+    clear; a path that links to another blob by now (a new card already)
+    is left alone. Blocking. Returns how many card paths were removed.
+    """
+    removed = 0
+    for card_filename, sha256 in cards:
+        path = CARDS_ROOT / card_filename
+        try:
+            if sha256 and not os.path.samefile(path, blob_path(sha256)):
+                continue
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+        thumb_path(path).unlink(missing_ok=True)
+    return removed
+
+
+def collect_blobs(grace_seconds: int = BLOB_GRACE_SECONDS) -> tuple[int, int]:
+    """
+    Delete blobs no card path links to any more (link count 1) and that are
+    older than *grace_seconds*. Returns ``(blobs removed, bytes freed)``.
+    """
+    removed = freed = 0
+    cutoff = time.time() - grace_seconds
+    for blob in BLOBS_ROOT.glob("*/*.png"):
+        try:
+            st = blob.stat()
+            if st.st_nlink == 1 and st.st_mtime < cutoff:
+                blob.unlink()
+                removed += 1
+                freed += st.st_size
+        except FileNotFoundError:
+            continue
+    return removed, freed
+
+
+async def existing_ids(
+    db: AsyncSession, batch: Batch, ids: List[uuid.UUID]
+) -> set[uuid.UUID]:
+    """Those of *ids* that are records of *batch*, looked up ``LOOKUP_CHUNK`` at a time."""
+    found: set[uuid.UUID] = set()
+    for start in range(0, len(ids), LOOKUP_CHUNK):
+        res = await db.execute(
+            select(CollabCard.id).where(
+                CollabCard.batch_id == batch.id,
+                CollabCard.id.in_(ids[start : start + LOOKUP_CHUNK]),
+            )
+        )
+        found.update(res.scalars())
+    return found
+
+
+async def mark_generated(db: AsyncSession, batch: Batch, ids: List[uuid.UUID]) -> int:
+    """
+    Flip *ids* to ``generated`` and add the ones that weren't already to the
+    batch's progress, in the caller's transaction. Returns that number.
+
+    Both steps are single UPDATE statements, so concurrent uploads to one
+    batch serialise on row locks instead of overwriting each other: a card
+    uploaded twice is only counted once, and ``status`` is derived from the
+    incremented counter inside the same statement.
+    """
+    newly = 0
+    for start in range(0, len(ids), LOOKUP_CHUNK):
+        res = await db.execute(
+            update(CollabCard)
+            .where(
+                CollabCard.batch_id == batch.id,
+                CollabCard.id.in_(ids[start : start + LOOKUP_CHUNK]),
+                CollabCard.status != RecordStatus.generated,
+            )
+            .values(status=RecordStatus.generated)
+            .returning(CollabCard.id)
+            .execution_options(synchronize_session=False)
+        )
+        newly += len(res.all())
+
+    if newly:
+        done = Batch.processed_records + newly  # SET sees the pre-update row
+        status_type = Batch.__table__.c.status.type
+        await db.execute(
+            update(Batch)
+            .where(Batch.id == batch.id)
+            .values(
+                processed_records=done,
+                status=case(
+                    (done >= Batch.total_records, literal(BatchStatus.completed, status_type)),
+                    else_=literal(BatchStatus.processing, status_type),
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+    return newly
+
+
+async def attach_cards(
+    db: AsyncSession, batch: Batch, card_files: dict[uuid.UUID, StoredCard]
+) -> int:
+    """
+    Point each record at its stored card (one executemany UPDATE) and mark
+    them generated; see :func:`mark_generated` for the return value. The
+    batch's ``updated_at`` moves either way (its cached summary is stale).
+    """
+    if not card_files:
+        return 0
+    cols = CollabCard.__table__.c
+    await db.execute(
+        update(CollabCard.__table__)
+        .where(cols.id == bindparam("b_id"))
+        .values(
+            card_filename=bindparam("b_card"),
+            card_sha256=bindparam("b_sha"),
+            card_bytes_original=None,  # a new card: not optimized yet
+            card_bytes=None,
+            generated_at=dt.datetime.utcnow(),
+        ),
+        [
+            {"b_id": rec_id, "b_card": str(card.path.relative_to(CARDS_ROOT)), "b_sha": card.sha256}
+            for rec_id, card in card_files.items()
+        ],
+    )
+    newly = await mark_generated(db, batch, list(card_files))
+    if not newly:  # replaced cards only: mark_generated left the batch row alone
+        await touch_batch(db, batch.id)
+    return newly
@@ -0,0 +1,185 @@
+# backend/app/services/events.py
+"""
+Batch progress pushed to browsers, fanned out through Redis pub/sub.
+
+Whoever commits a change to a batch (ingest, card uploads, the render
+worker) calls :func:`publish_batch`, which reads the row back and publishes
+it on ``batches:<company id>`` (``batches:global`` for batches without a
+company). Any API process can hold the subscribers: each runs one
+:class:`EventHub`, a single pattern subscription that hands messages to
+the local listeners of that company, however many SSE clients are open.
+
+Events are snapshots of the batch, not deltas, so a listener that falls
+behind only gets the newest one per batch. Publishing is best
+effort: with Redis down the change is still committed, the event is just
+logged and dropped.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime as dt
+import json
+import logging
+import time
+import uuid
+from typing import AsyncIterator, Mapping
+
+import anyio
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models import Batch
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "batches:"
+RECONNECT_DELAY = 1.0   # first wait before re-subscribing after losing Redis …
+RECONNECT_MAX = 30.0    # … doubling up to this
+PUBLISH_BACKOFF = 10.0  # after a failed publish, drop events this long instead of waiting on Redis
+
+# batch columns an event carries (BatchRead plus the company and version)
+EVENT_FIELDS = (
+    "id",
+    "company_id",
+    "original_filename",
+    "total_records",
+    "processed_records",
+    "rejected_records",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+# publishing is sync and thread-safe, so the worker (a fresh event loop
+# per job) and the API share one code path without loop-bound connections
+_publisher = redis.Redis.from_url(
+    settings.redis_url, socket_connect_timeout=1, socket_timeout=1
+)
+_quiet_until = 0.0
+
+
+def channel_for(company_id: uuid.UUID | None) -> str:
+    return f"{CHANNEL_PREFIX}{company_id or 'global'}"
+
+
+def _encode(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, dt.datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)  # enums
+
+
+def _publish(channel: str, payload: str) -> None:
+    global _quiet_until
+    if time.monotonic() < _quiet_until:
+        return
+    try:
+        _publisher.publish(channel, payload)
+    except (redis.RedisError, OSError):
+        _quiet_until = time.monotonic() + PUBLISH_BACKOFF
+        logger.warning("could not publish batch event on %s", channel, exc_info=True)
+
+
+def event_columns() -> list:
+    cols = Batch.__table__.c
+    return [cols[f] for f in EVENT_FIELDS]
+
+
+def encode_event(row: Mapping) -> str:
+    """JSON of a row selected with :func:`event_columns`."""
+    return json.dumps({k: _encode(v) for k, v in row.items()})
+
+
+async def publish_batch(db: AsyncSession, batch_id: uuid.UUID) -> None:
+    """
+    Publish the committed state of *batch_id*. Call it after the commit:
+    the row is read back, so counters bumped in SQL are current too.
+    """
+    row = (
+        await db.execute(select(*event_columns()).where(Batch.__table__.c.id == batch_id))
+    ).mappings().one_or_none()
+    if row is None:
+        return
+    await anyio.to_thread.run_sync(_publish, channel_for(row["company_id"]), encode_event(row))
+
+
+class Listener:
+    """Events of one company not read yet, newest per batch."""
+
+    def __init__(self) -> None:
+        self._pending: dict[str, str] = {}
+        self._ready = asyncio.Event()
+
+    def put(self, batch_id: str, payload: str) -> None:
+        self._pending[batch_id] = payload
+        self._ready.set()
+
+    async def get(self) -> list[str]:
+        """Wait for events, then return (and forget) all of them."""
+        await self._ready.wait()
+        self._ready.clear()
+        events = list(self._pending.values())
+        self._pending.clear()
+        return events
+
+
+class EventHub:
+    """One Redis subscription per process, shared by every local listener."""
+
+    def __init__(self) -> None:
+        self._listeners: dict[str, set[Listener]] = {}
+        self._task: asyncio.Task | None = None
+
+    @contextlib.asynccontextmanager
+    async def listen(self, company_id: uuid.UUID | None) -> AsyncIterator[Listener]:
+        """A :class:`Listener` for the events of *company_id* while the block runs."""
+        channel = channel_for(company_id)
+        listener = Listener()
+        self._listeners.setdefault(channel, set()).add(listener)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            yield listener
+        finally:
+            listeners = self._listeners.get(channel, set())
+            listeners.discard(listener)
+            if not listeners:
+                self._listeners.pop(channel, None)
+            if not self._listeners and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    def _deliver(self, channel: str, payload: str) -> None:
+        listeners = self._listeners.get(channel)
+        if not listeners:
+            return
+        batch_id = json.loads(payload)["id"]
+        for listener in listeners:
+            listener.put(batch_id, payload)
+
+    async def _run(self) -> None:
+        delay = RECONNECT_DELAY
+        while True:
+            client = aioredis.Redis.from_url(settings.redis_url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                    delay = RECONNECT_DELAY
+                    async for message in pubsub.listen():
+                        if message["type"] == "pmessage":
+                            self._deliver(message["channel"].decode(), message["data"].decode())
+            except (redis.RedisError, OSError) as exc:
+                logger.warning("batch event subscription lost (%s), retrying in %.0fs", exc, delay)
+            finally:
+                await client.aclose()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX)
+
+
+hub = EventHub()
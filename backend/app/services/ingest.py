@@ -0,0 +1,433 @@
+# backend/app/services/ingest.py
+"""
+Spreadsheet → CollabCard parsing shared by the upload endpoints and the
+Celery ingest task.
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import hashlib
+import os
+import pickle
+import re
+import unicodedata
+from pathlib import Path
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+)
+
+from openpyxl import load_workbook
+
+from app.services.rejections import REQUIRED_FIELDS_ORDER, RejectionLog, RejectReason, missing_mask
+
+
+def _collapse(text: str | None) -> str:
+    """lower-case, strip accents & punctuation; return '' for None."""
+    if not isinstance(text, str):
+        return ""
+    text = text.lower()
+    text = "".join(
+        c for c in unicodedata.normalize("NFD", text) if unicodedata.category(c) != "Mn"
+    )
+    return re.sub(r"[^a-z0-9]+", "", text)
+
+
+SPANISH_TO_ENGLISH: Dict[str, str] = {
+    _collapse("Nombre"): "full_name",
+    _collapse("Correo Electrónico"): "email",
+    _collapse("Correo Electronico"): "email",
+    _collapse("Correo"): "email",
+    _collapse("Celular"): "mobile_phone",
+    _collapse("Puesto"): "job_title",
+    _collapse("Teléfono Oficina"): "office_phone",
+    _collapse("Teléfono Ofi"): "office_phone",
+    _collapse("Telefono Ofi"): "office_phone",
+}
+
+RECORD_FIELDS = ("full_name", "email", "mobile_phone", "job_title", "office_phone")
+REQUIRED_FIELDS = set(REQUIRED_FIELDS_ORDER)
+BATCH_SIZE = 5_000
+ALL_SHEETS = "*"
+CSV_SNIFF_BYTES = 64 * 1024
+CSV_DELIMITERS = ",;\t|"
+
+
+def row_hash(values: Sequence) -> str:
+    """
+    Digest of one record's ``RECORD_FIELDS`` values, stored on each CollabCard
+    so a re-upload can tell changed rows from untouched ones. Missing and
+    empty values hash alike (the parser never yields empty strings anyway).
+    """
+    joined = "\x1f".join("" if v is None else str(v) for v in values)
+    return hashlib.blake2b(joined.encode(), digest_size=16).hexdigest()
+
+
+class RecordParser:
+    """
+    Single-pass row → record parser.
+
+    Feed rows in sheet order. Rows before the header are skipped; the header
+    row compiles a column plan (cell index → field) that every later row is
+    run through, so each row is looked at exactly once.
+
+    Every dropped row after the header is reported to *on_reject* as
+    ``(row number, reason, missing-field mask)``; row numbers count every row
+    fed, starting at 1, so they match the sheet's own numbering. Blank rows
+    are only reported once data follows them, which keeps the empty tail
+    most spreadsheets carry out of the report.
+    """
+
+    def __init__(self, on_reject: Callable[[int, RejectReason, int], None] | None = None) -> None:
+        self.plan: tuple[tuple[int, str], ...] | None = None
+        self.row_no = 0
+        self._on_reject = on_reject
+        self._blank_from = 0  # first row of the current run of blank rows
+        # repeated header rows are spotted on the plan's first column
+        self._key_ix = 0
+        self._key_aliases: frozenset[str] = frozenset()
+        self._key_initials: frozenset[str] = frozenset()
+
+    def _compile(self, row: Sequence) -> None:
+        mapped = {
+            ix: SPANISH_TO_ENGLISH[key]
+            for ix, key in ((ix, _collapse(c)) for ix, c in enumerate(row))
+            if key in SPANISH_TO_ENGLISH
+        }
+        if not REQUIRED_FIELDS <= set(mapped.values()):
+            return
+        self.plan = tuple(sorted(mapped.items()))
+        self._key_ix, key_field = self.plan[0]
+        self._key_aliases = frozenset(
+            k for k, f in SPANISH_TO_ENGLISH.items() if f == key_field
+        )
+        self._key_initials = frozenset(k[0] for k in self._key_aliases)
+
+    def _is_header(self, row: Sequence) -> bool:
+        if self._key_ix >= len(row):
+            return False
+        val = row[self._key_ix]
+        if not isinstance(val, str) or val.lstrip()[:1].lower() not in self._key_initials:
+            return False  # cheap reject before the unicode fold
+        return _collapse(val) in self._key_aliases
+
+    def _reject(self, reason: RejectReason, missing: int = 0) -> None:
+        if self._on_reject is not None:
+            self._on_reject(self.row_no, reason, missing)
+
+    def feed(self, row: Sequence) -> dict | None:
+        """Return the normalised record for *row*, or None if it is skipped."""
+        self.row_no += 1
+        if not any(row):
+            if self.plan is not None and not self._blank_from:
+                self._blank_from = self.row_no
+            return None  # blank
+
+        if self._blank_from:
+            if self._on_reject is not None:
+                for n in range(self._blank_from, self.row_no):
+                    self._on_reject(n, RejectReason.blank, 0)
+            self._blank_from = 0
+
+        if self.plan is None:
+            self._compile(row)
+            return None
+
+        if self._is_header(row):
+            self._reject(RejectReason.header)
+            return None  # header repeated further down the sheet
+
+        record: dict = {}
+        width = len(row)
+        for ix, field in self.plan:
+            if ix >= width:
+                break
+            val = row[ix]
+            if val is None:
+                continue
+            val = val.strip() if isinstance(val, str) else str(val).strip()
+            if val:
+                record[field] = val
+
+        missing = REQUIRED_FIELDS - record.keys()
+        if missing:
+            self._reject(RejectReason.missing_fields, missing_mask(missing))
+            return None  # missing mandatory data
+
+        if record["full_name"].isdigit():  # row-number row
+            self._reject(RejectReason.numeric_name)
+            return None
+
+        return record
+
+    def finish(self) -> None:
+        """Raise if the whole input went by without a usable header row."""
+        if self.plan is None:
+            raise ValueError(f"missing columns {REQUIRED_FIELDS}")
+
+
+def iter_records(
+    rows: Iterable[Sequence],
+    on_reject: Callable[[int, RejectReason, int], None] | None = None,
+) -> Iterator[dict]:
+    """Run *rows* through a fresh :class:`RecordParser`, yielding records."""
+    parser = RecordParser(on_reject)
+    for row in rows:
+        record = parser.feed(row)
+        if record is not None:
+            yield record
+    parser.finish()
+
+
+def iter_xlsx_records(path: Path, rejections: RejectionLog | None = None) -> Iterator[dict]:
+    """Yield one normalised CollabCard field dict per data row of the active sheet."""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = wb.active
+        on_reject = None
+        if rejections is not None:
+            rejections.sheets = [sheet.title]
+            on_reject = rejections.add
+        yield from iter_records(sheet.iter_rows(values_only=True), on_reject)
+    finally:
+        wb.close()
+
+
+_SheetResult = tuple[List[tuple], tuple]  # (records, RejectionLog.columns())
+
+
+def _parse_sheet(path: str, sheet: str, strict: bool) -> _SheetResult | None:
+    """
+    Parse one sheet into ``RECORD_FIELDS``-ordered tuples plus the sheet's
+    rejection columns.
+
+    Tuples pickle far smaller than dicts (see :func:`save_sheet`). A sheet
+    without a header row raises when *strict*, otherwise returns None.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    rejected = RejectionLog()
+    try:
+        records = [
+            tuple(rec.get(f) for f in RECORD_FIELDS)
+            for rec in iter_records(wb[sheet].iter_rows(values_only=True), rejected.add)
+        ]
+        return records, rejected.columns()
+    except ValueError:
+        if strict:
+            raise ValueError(f"sheet {sheet!r}: missing columns {REQUIRED_FIELDS}")
+        return None
+    finally:
+        wb.close()
+
+
+def sheet_names(path: Path, sheets: Sequence[str]) -> tuple[List[str], bool]:
+    """
+    Resolve *sheets* (names, or ``[ALL_SHEETS]``) against the workbook.
+
+    Returns ``(names, strict)``: *strict* is False for ``[ALL_SHEETS]``,
+    where sheets without a header row (e.g. a notes tab) are skipped.
+    """
+    wb = load_workbook(path, read_only=True)
+    names = wb.sheetnames
+    wb.close()
+
+    strict = list(sheets) != [ALL_SHEETS]
+    if strict:
+        unknown = [s for s in sheets if s not in names]
+        if unknown:
+            raise ValueError(f"unknown sheets {unknown}; workbook has {names}")
+        names = list(dict.fromkeys(sheets))
+    return names, strict
+
+
+def _iter_sheet_results(
+    names: List[str],
+    results: Iterable[_SheetResult | None],
+    rejections: RejectionLog | None,
+) -> Iterator[tuple]:
+    if rejections is not None:
+        rejections.sheets = names
+
+    with_header = 0
+    for ix, result in enumerate(results):
+        if result is not None:
+            with_header += 1
+            rows, rejected = result
+            if rejections is not None:
+                rejections.extend(rejected, sheet=ix)
+            yield from rows
+
+    if not with_header:
+        raise ValueError(f"no sheet has columns {REQUIRED_FIELDS}")
+
+
+def iter_workbook_records(
+    path: Path, sheets: Sequence[str], rejections: RejectionLog | None = None
+) -> Iterator[tuple]:
+    """
+    Yield record tuples from several sheets of one workbook, one sheet after
+    the other (see :func:`sheet_names` for *sheets*).
+    """
+    names, strict = sheet_names(path, sheets)
+    yield from _iter_sheet_results(
+        names, (_parse_sheet(str(path), name, strict) for name in names), rejections
+    )
+
+
+def save_sheet(path: str, sheet: str, strict: bool, out: str) -> None:
+    """
+    Parse one sheet into the pickle file *out*, so that sheets can be parsed
+    by separate processes (the ``cards.parse_sheet`` task) and read back in
+    order by :func:`iter_saved_sheets`. An error is saved in place of the
+    result and raised again there.
+    """
+    try:
+        result: _SheetResult | None | Exception = _parse_sheet(path, sheet, strict)
+    except Exception as exc:  # noqa: BLE001
+        result = exc
+    out_path = Path(out)
+    tmp = out_path.with_name(out_path.name + ".part")
+    with tmp.open("wb") as fh:
+        pickle.dump(result, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(out_path)
+
+
+def iter_saved_sheets(
+    names: List[str], saved: List[str], rejections: RejectionLog | None = None
+) -> Iterator[tuple]:
+    """
+    :func:`iter_workbook_records` over the files :func:`save_sheet` wrote
+    for *names*; the files are deleted as they are read, and all of them
+    once the iterator is closed.
+    """
+
+    def _results() -> Iterator[_SheetResult | None]:
+        for out in saved:
+            with open(out, "rb") as fh:
+                result = pickle.load(fh)
+            os.unlink(out)
+            if isinstance(result, Exception):
+                raise result
+            yield result
+
+    try:
+        yield from _iter_sheet_results(names, _results(), rejections)
+    finally:
+        for out in saved:
+            Path(out).unlink(missing_ok=True)
+
+
+# ──────────────────────────────────────────────────────────────
+# CSV / TSV (streamed straight from the request body)
+# ──────────────────────────────────────────────────────────────
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _sniff_encoding(sample: bytes) -> str:
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # final=False: the sample may end in the middle of a multi-byte char
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1252"  # Excel's "CSV" export on Spanish-locale Windows
+
+
+# csv only treats \r / \n as record separators (unlike str.splitlines)
+_LINE_RE = re.compile(r"[^\r\n]*(?:\r\n?|\n)|[^\r\n]+\Z")
+
+
+def _sniff_dialect(text: str) -> type[csv.Dialect]:
+    lines = [line.rstrip("\r\n") for line in _LINE_RE.findall(text)[:50]]
+    try:
+        return csv.Sniffer().sniff("\n".join(lines), delimiters=CSV_DELIMITERS)
+    except csv.Error:
+        # single-column or very irregular sample: pick the most frequent delimiter
+        head = lines[0] if lines else ""
+        delimiter = max(CSV_DELIMITERS, key=head.count)
+        return type("_Sniffed", (csv.excel,), {"delimiter": delimiter})
+
+
+async def aiter_csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[List[str]]:
+    """
+    Decode and split an async byte stream into CSV rows.
+
+    Encoding and delimiter are sniffed from the first ``CSV_SNIFF_BYTES``;
+    after that only the current chunk plus one partial record is held.
+    """
+    stream = chunks.__aiter__()
+    sample = b""
+    async for chunk in stream:
+        sample += chunk
+        if len(sample) >= CSV_SNIFF_BYTES:
+            break
+
+    encoding = _sniff_encoding(sample)
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    first = decoder.decode(sample)
+    dialect = _sniff_dialect(first)
+    quote = getattr(dialect, "quotechar", None) or '"'
+
+    carry = ""          # trailing text without a newline yet
+    record: List[str] = []  # lines of a record whose quoted field spans newlines
+    in_quotes = False
+
+    def _complete_lines(text: str, final: bool) -> List[str]:
+        nonlocal carry, record, in_quotes
+        lines = _LINE_RE.findall(carry + text)
+        # a bare trailing "\r" may be the first half of a "\r\n" split across
+        # chunks: hold it back until the next chunk shows which it is
+        carry = (
+            "" if final or not lines or lines[-1].endswith("\n") else lines.pop()
+        )
+        done: List[str] = []
+        for line in lines:
+            record.append(line)
+            if line.count(quote) % 2:
+                in_quotes = not in_quotes
+            if not in_quotes:
+                done.append("".join(record))
+                record = []
+        return done
+
+    for row in csv.reader(_complete_lines(first, final=False), dialect):
+        yield row
+
+    async for chunk in stream:
+        for row in csv.reader(_complete_lines(decoder.decode(chunk), final=False), dialect):
+            yield row
+
+    tail = _complete_lines(decoder.decode(b"", final=True), final=True)
+    if record:  # unbalanced quote at EOF – let csv make what it can of it
+        tail.append("".join(record))
+    for row in csv.reader(tail, dialect):
+        yield row
+
+
+async def aiter_csv_records(
+    chunks: AsyncIterable[bytes], rejections: RejectionLog | None = None
+) -> AsyncIterator[dict]:
+    """
+    CSV counterpart of :func:`iter_xlsx_records`; rejected rows are numbered
+    by CSV record, which only differs from the line number when a quoted
+    field spans lines.
+    """
+    parser = RecordParser(rejections.add if rejections is not None else None)
+    async for row in aiter_csv_rows(chunks):
+        record = parser.feed(row)
+        if record is not None:
+            yield record
+    parser.finish()
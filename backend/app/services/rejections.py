@@ -0,0 +1,143 @@
+# backend/app/services/rejections.py
+"""
+Rows dropped during ingest, and the side file they are reported in.
+
+``rejections.bin`` sits next to the uploaded spreadsheet and is columnar so
+that any page can be served with a handful of seeks:
+
+    b"REJ1" | u32 header_len | header (JSON: sheets, counts) | u32 count
+    | u32 row[count] | u8 reason[count] | u8 missing[count] | u16 sheet[count]
+
+All integers are little-endian. ``missing`` is a bitmask over
+``REQUIRED_FIELDS_ORDER`` and only set for ``missing_fields`` rejections.
+"""
+from __future__ import annotations
+
+import enum
+import json
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterator, List
+
+MAGIC = b"REJ1"
+REJECTIONS_FILE = "rejections.bin"
+REQUIRED_FIELDS_ORDER = ("full_name", "email", "job_title")
+
+# (typecode, item size) of the row / reason / missing / sheet columns
+_COLUMNS = (("I", 4), ("B", 1), ("B", 1), ("H", 2))
+
+
+class RejectReason(enum.IntEnum):
+    blank = 1           # empty row between data rows
+    header = 2          # header row repeated further down
+    missing_fields = 3  # one or more REQUIRED_FIELDS empty
+    numeric_name = 4    # full_name is just a number (row-number row)
+
+
+def missing_mask(missing: set[str]) -> int:
+    return sum(1 << ix for ix, f in enumerate(REQUIRED_FIELDS_ORDER) if f in missing)
+
+
+def missing_fields(mask: int) -> List[str]:
+    return [f for ix, f in enumerate(REQUIRED_FIELDS_ORDER) if mask & (1 << ix)]
+
+
+def _le(arr: array) -> array:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+class RejectionLog:
+    """
+    Append-only, in-memory columns (8 bytes per rejected row) until
+    :meth:`save` writes them to *path*. Process-pool workers use a path-less
+    log and ship its :meth:`columns` back to the parent.
+    """
+
+    def __init__(self, path: Path | None = None, sheets: List[str] | None = None) -> None:
+        self.path = path
+        self.sheets: List[str] = list(sheets or [])
+        self.rows = array("I")
+        self.reasons = array("B")
+        self.missing = array("B")
+        self.sheet_ix = array("H")
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, row: int, reason: RejectReason, missing: int = 0, sheet: int = 0) -> None:
+        self.rows.append(row)
+        self.reasons.append(reason)
+        self.missing.append(missing)
+        self.sheet_ix.append(sheet)
+
+    def columns(self) -> tuple[array, array, array]:
+        """Picklable (rows, reasons, missing) for shipping out of a worker process."""
+        return self.rows, self.reasons, self.missing
+
+    def extend(self, columns: tuple[array, array, array], sheet: int) -> None:
+        rows, reasons, missing = columns
+        self.rows.extend(rows)
+        self.reasons.extend(reasons)
+        self.missing.extend(missing)
+        self.sheet_ix.extend(array("H", [sheet]) * len(rows))
+
+    def counts(self) -> dict[str, int]:
+        return {
+            r.name: n for r in RejectReason if (n := self.reasons.count(r))
+        }
+
+    def save(self) -> None:
+        path = self.path
+        header = json.dumps({"sheets": self.sheets, "counts": self.counts()}).encode()
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as out:
+            out.write(MAGIC)
+            out.write(struct.pack("<I", len(header)))
+            out.write(header)
+            out.write(struct.pack("<I", len(self)))
+            for col in (self.rows, self.reasons, self.missing, self.sheet_ix):
+                _le(col).tofile(out)
+        os.replace(tmp, path)
+
+
+def read_rejections(path: Path, offset: int, limit: int) -> tuple[dict, int, Iterator[dict]]:
+    """
+    Return ``(header, total, items)`` for one page of a saved report; *items*
+    yields ``{"sheet", "row", "reason", "missing"}`` dicts.
+    """
+    with path.open("rb") as f:
+        if f.read(4) != MAGIC:
+            raise ValueError(f"{path} is not a rejection report")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len))
+        (total,) = struct.unpack("<I", f.read(4))
+
+        start = min(offset, total)
+        n = min(limit, total - start)
+        base = f.tell()
+        cols: List[array] = []
+        for typecode, size in _COLUMNS:
+            f.seek(base + start * size)
+            col = array(typecode)
+            col.frombytes(f.read(n * size))
+            cols.append(_le(col))
+            base += total * size
+
+    sheets = header.get("sheets") or []
+    rows, reasons, missing, sheet_ix = cols
+    items = (
+        {
+            "sheet": sheets[sheet_ix[i]] if sheet_ix[i] < len(sheets) else None,
+            "row": rows[i],
+            "reason": RejectReason(reasons[i]).name,
+            "missing": missing_fields(missing[i]),
+        }
+        for i in range(n)
+    )
+    return header, total, items
@@ -0,0 +1,217 @@
+# backend/app/services/render.py
+"""
+Server-side card rendering with Pillow, run inside the Celery worker.
+
+A card is the company's background template with the record's data drawn on
+top. Fonts and decoded templates are cached per worker process, so a chunk
+of records costs one ``stat`` of the template plus, per card, a copy of the
+background, the text layout and the PNG encode.
+
+Templates are plain PNGs under ``<upload_dir>/templates/``: ``<company
+id>.png``, else ``default.png``, else a white card. Replacing a file is
+picked up on the next chunk (the cache is keyed on its mtime).
+"""
+from __future__ import annotations
+
+import io
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Mapping
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+CARD_SIZE = (1050, 600)  # 3.5" × 2" at 300 dpi
+TEMPLATES_ROOT = Path(settings.upload_dir or "/data/uploads").joinpath("templates")
+DEFAULT_TEMPLATE = "default.png"
+# zlib level 1: ~16 ms vs ~25 ms per card at 6, for ~20% larger files; the
+# optimize stage (optimize_png) recompresses stored cards off the render path
+PNG_COMPRESS_LEVEL = 1
+
+# used when settings.card_font_path / card_font_bold_path are unset; Pillow's
+# bundled font is the last resort and has no accented glyphs (á, ñ, …)
+FALLBACK_FONTS = {
+    False: "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    True: "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+}
+
+THUMB_WIDTH = 320       # previews in the batch page; height follows the aspect ratio
+THUMB_QUALITY = 80
+
+MARGIN = 60
+INK = (33, 37, 41)
+MUTED = (108, 117, 125)
+
+
+# ──────────────────────────────────────────────────────────────
+# per-process caches
+# ──────────────────────────────────────────────────────────────
+@lru_cache(maxsize=64)
+def _font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+    path = (settings.card_font_bold_path if bold else settings.card_font_path) or FALLBACK_FONTS[bold]
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=32)
+def _load_template(path: str, mtime_ns: int) -> Image.Image:
+    with Image.open(path) as im:
+        im = im.convert("RGB")
+    return im if im.size == CARD_SIZE else im.resize(CARD_SIZE, Image.LANCZOS)
+
+
+@lru_cache(maxsize=1)
+def _blank() -> Image.Image:
+    return Image.new("RGB", CARD_SIZE, "white")
+
+
+def template_for(company_id: uuid.UUID | None) -> Image.Image:
+    """Decoded background for *company_id*; treat as read-only (it is shared)."""
+    names = ([f"{company_id}.png"] if company_id else []) + [DEFAULT_TEMPLATE]
+    for name in names:
+        path = TEMPLATES_ROOT / name
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+        return _load_template(str(path), mtime_ns)
+    return _blank()
+
+
+# ──────────────────────────────────────────────────────────────
+# drawing
+# ──────────────────────────────────────────────────────────────
+def _fit(text: str, size: int, width: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+    """Largest font ≤ *size* (in 4 px steps) that keeps *text* within *width*."""
+    while size > 16:
+        font = _font(size, bold)
+        if font.getlength(text) <= width:
+            return font
+        size -= 4
+    return _font(size, bold)
+
+
+def _phone(value: str | None, prefix: str | None) -> str | None:
+    if value and prefix and not value.startswith("+"):
+        return f"{prefix} {value}"
+    return value
+
+
+def render_card(template: Image.Image, record: Mapping, company: Mapping) -> Image.Image:
+    """Draw one CollabCard (*record*) for *company* onto a copy of *template*."""
+    img = template.copy()
+    draw = ImageDraw.Draw(img)
+    width = CARD_SIZE[0] - 2 * MARGIN
+    prefix = company.get("phone_prefix")
+
+    if company.get("name"):
+        draw.text((MARGIN, MARGIN), company["name"], font=_fit(company["name"], 30, width, True), fill=MUTED)
+
+    y = 180
+    draw.text((MARGIN, y), record["full_name"], font=_fit(record["full_name"], 64, width, True), fill=INK)
+    y += 84
+    if record.get("job_title"):
+        draw.text((MARGIN, y), record["job_title"], font=_fit(record["job_title"], 34, width), fill=MUTED)
+        y += 70
+
+    contact = (
+        record.get("email"),
+        _phone(record.get("mobile_phone"), prefix),
+        _phone(record.get("office_phone"), prefix),
+    )
+    for line in filter(None, contact):
+        draw.text((MARGIN, y), line, font=_fit(line, 28, width), fill=INK)
+        y += 42
+
+    if company.get("web"):
+        font = _font(24)
+        draw.text(
+            (CARD_SIZE[0] - MARGIN - font.getlength(company["web"]), CARD_SIZE[1] - MARGIN - 24),
+            company["web"],
+            font=font,
+            fill=MUTED,
+        )
+    return img
+
+
+def encode_card(img: Image.Image) -> bytes:
+    """*img* as PNG bytes, ready for ``card_store.store_card_bytes``."""
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buf.getvalue()
+
+
+def write_thumbnail(src: Image.Image | Path, dest_path: Path) -> None:
+    """
+    Save a ``THUMB_WIDTH``-wide WebP preview of *src* (an image already in
+    memory, or a card file) at *dest_path*; the file appears atomically.
+    """
+    if isinstance(src, Path):
+        with Image.open(src) as im:
+            im.thumbnail((THUMB_WIDTH, THUMB_WIDTH * 4))
+            thumb = im.convert("RGBA" if im.mode in ("RGBA", "LA", "P") else "RGB")
+    else:
+        thumb = src.copy()
+        thumb.thumbnail((THUMB_WIDTH, THUMB_WIDTH * 4))
+
+    tmp = dest_path.with_name(f"{dest_path.name}.{uuid.uuid4().hex}.part")  # per writer
+    thumb.save(tmp, format="WEBP", quality=THUMB_QUALITY)
+    tmp.replace(dest_path)
+
+
+# ──────────────────────────────────────────────────────────────
+# lossless recompression
+# ──────────────────────────────────────────────────────────────
+def _png(img: Image.Image, info: Mapping) -> bytes:
+    buf = io.BytesIO()
+    extra = {k: info[k] for k in ("icc_profile", "dpi") if info.get(k)}
+    img.save(buf, format="PNG", optimize=True, **extra)
+    return buf.getvalue()
+
+
+def _palette(img: Image.Image) -> Image.Image | None:
+    """*img* as an exact 8-bit palette image, if it has at most 256 colours."""
+    if img.mode not in ("RGB", "RGBA") or img.getcolors(256) is None:
+        return None
+    method = Image.Quantize.FASTOCTREE if img.mode == "RGBA" else Image.Quantize.MEDIANCUT
+    pal = img.quantize(256, method=method, dither=Image.Dither.NONE)
+    # quantize() copies info: an RGB colour key (tRNS) must become the index
+    # of that colour, or be dropped if no pixel has it
+    key = pal.info.pop("transparency", None)
+    if isinstance(key, tuple) and (index := pal.palette.colors.get(key[:3])) is not None:
+        pal.info["transparency"] = index
+    return pal
+
+
+def _same_pixels(data: bytes, img: Image.Image) -> bool:
+    # a colour key is part of the image: compare with it applied
+    mode = "RGBA" if "transparency" in img.info else img.mode
+    with Image.open(io.BytesIO(data)) as im:
+        return ImageChops.difference(im.convert(mode), img.convert(mode)).getbbox() is None
+
+
+def optimize_png(data: bytes) -> bytes | None:
+    """
+    Smallest lossless re-encode of the PNG *data* (``optimize=True``, plus a
+    palette when the image has ≤ 256 colours), or None if nothing beats it.
+    Candidates are decoded again and compared pixel for pixel before use.
+    """
+    with Image.open(io.BytesIO(data)) as im:
+        im.load()
+        info = dict(im.info)
+    candidates = []
+    if (pal := _palette(im)) is not None:
+        candidates.append(_png(pal, info))
+    candidates.append(_png(im, info))
+    for out in sorted(candidates, key=len):
+        if len(out) >= len(data):
+            break
+        if _same_pixels(out, im):
+            return out
+    return None
@@ -1,4 +1,5 @@
 import datetime as dt
+import time
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -34,4 +35,38 @@ def create_access_token(subject: str) -> str:
 
 def decode_access_token(token: str) -> str:
     payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    if "scope" in payload:
+        raise JWTError("scoped tokens only open their own URLs")
+    return payload["sub"]
+
+
+# ── scoped tokens, for URLs that can't carry a header (<img>, links, EventSource) ──
+def card_scope(batch_id) -> str:
+    return f"cards:{batch_id}"
+
+
+def events_scope(company_id) -> str:
+    return f"events:{company_id}"
+
+
+def create_scoped_token(subject: str, scope: str) -> tuple[str, dt.datetime]:
+    """
+    A token that only opens *scope*, and its expiry. The expiry is rounded up
+    to a multiple of ``query_token_expire_minutes`` (so it lives one to two
+    of those): asked again within the window, the same token comes back and
+    URLs built with it stay cached.
+    """
+    window = settings.query_token_expire_minutes * 60
+    expire = (int(time.time()) // window + 2) * window
+    to_encode = {"sub": subject, "scope": scope, "exp": expire}
+    return (
+        jwt.encode(to_encode, settings.secret_key, algorithm="HS256"),
+        dt.datetime.utcfromtimestamp(expire),
+    )
+
+
+def decode_scoped_token(token: str, scope: str) -> str:
+    payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    if payload.get("scope") != scope:
+        raise JWTError("token not valid for this URL")
     return payload["sub"]
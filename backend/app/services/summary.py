@@ -0,0 +1,80 @@
+# backend/app/services/summary.py
+"""
+Per-status record counts of a batch, cached per process.
+
+A summary is one ``GROUP BY status`` over the batch's records, cached under
+the batch's ``updated_at``. Every path that changes a batch's records also
+moves that timestamp in the same transaction: the ingest and the counters
+through the ORM, card uploads, rendering and the optimize stage through
+:func:`touch_batch`. So a cached entry is current exactly while the batch
+row still carries its version, whichever process made the change, and a
+poll costs the primary-key lookup of the batch.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Batch, CollabCard
+from app.models.enums import RecordStatus
+
+SUMMARY_CACHE_SIZE = 1_024  # batches kept; least recently polled go first
+
+
+class BatchCounts(NamedTuple):
+    counts: dict[str, int]  # every RecordStatus, zero-filled
+    card_bytes: int         # stored size of the generated cards that have one
+    unmeasured: int         # generated cards still waiting for the optimize stage
+
+
+_cache: OrderedDict[uuid.UUID, tuple[dt.datetime, BatchCounts]] = OrderedDict()
+
+
+async def touch_batch(db: AsyncSession, batch_id: uuid.UUID) -> None:
+    """Bump the batch's ``updated_at`` in the caller's transaction (its records changed)."""
+    await db.execute(
+        update(Batch.__table__)
+        .where(Batch.__table__.c.id == batch_id)
+        .values(updated_at=dt.datetime.utcnow())
+    )
+
+
+async def _count(db: AsyncSession, batch_id: uuid.UUID) -> BatchCounts:
+    cols = CollabCard.__table__.c
+    rows = await db.execute(
+        select(
+            cols.status,
+            func.count(),
+            func.coalesce(func.sum(cols.card_bytes), 0),
+            func.count().filter(cols.card_bytes.is_(None)),
+        )
+        .where(cols.batch_id == batch_id)
+        .group_by(cols.status)
+    )
+    counts = dict.fromkeys((s.value for s in RecordStatus), 0)
+    card_bytes = unmeasured = 0
+    for status, n, size, missing in rows:
+        counts[RecordStatus(status).value] = n
+        if status == RecordStatus.generated:
+            card_bytes, unmeasured = int(size), missing
+    return BatchCounts(counts, card_bytes, unmeasured)
+
+
+async def batch_counts(db: AsyncSession, batch: Batch) -> BatchCounts:
+    """The record counts of *batch*, from the cache while its ``updated_at`` holds."""
+    hit = _cache.get(batch.id)
+    if hit is not None and hit[0] == batch.updated_at:
+        _cache.move_to_end(batch.id)
+        return hit[1]
+
+    result = await _count(db, batch.id)
+    _cache[batch.id] = (batch.updated_at, result)
+    _cache.move_to_end(batch.id)
+    while len(_cache) > SUMMARY_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
@@ -1,6 +1,50 @@
 # backend/app/services/tasks.py
-from celery import Celery
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
 import os
+import uuid
+from pathlib import Path
+from typing import List
+
+from celery import Celery, chord, group
+from celery.utils.log import get_task_logger
+from sqlalchemy import bindparam, or_, select, update
+
+from app.core.card_files import thumb_path
+from app.core.database import WorkerSessionLocal
+from app.models import Batch, CollabCard, Company
+from app.models.enums import RecordStatus
+from app.services.bulk import ingest_into_batch, upsert_into_batch
+from app.services.card_store import (
+    CARDS_ROOT,
+    StoredCard,
+    attach_cards,
+    blob_path,
+    card_dest_dir,
+    collect_blobs,
+    store_card_bytes,
+)
+from app.services.events import publish_batch
+from app.services.ingest import (
+    RECORD_FIELDS,
+    iter_saved_sheets,
+    iter_workbook_records,
+    iter_xlsx_records,
+    save_sheet,
+    sheet_names,
+)
+from app.services.render import (
+    encode_card,
+    optimize_png,
+    render_card,
+    template_for,
+    write_thumbnail,
+)
+from app.services.rejections import REJECTIONS_FILE, RejectionLog
+from app.services.summary import touch_batch
+from app.services.upload_sessions import collect_uploads
 
 celery = Celery(
     "cards",
@@ -8,7 +52,363 @@ celery = Celery(
     backend=os.getenv("CELERY_BACKEND_URL", "redis://redis:6379/0"),
 )
 
+logger = get_task_logger(__name__)
+
+RENDER_CHUNK = 250                        # records per render_chunk task
+RENDER_STALE = dt.timedelta(hours=1)      # "generating" longer than this → crashed, re-claim
+
+
 @celery.task
 def ping() -> str:
     """Simple connectivity test."""
     return "pong"
+
+
+# ──────────────────────────────────────────────────────────────
+# XLSX ingest
+# ──────────────────────────────────────────────────────────────
+async def _ingest_xlsx(
+    batch_id: uuid.UUID,
+    path: Path,
+    sheets: List[str] | None,
+    update: bool = False,
+    saved: List[str] | None = None,
+    content_sha256: str | None = None,
+) -> int:
+    async with WorkerSessionLocal() as db:
+        batch = await db.get(Batch, batch_id)
+        if batch is None:
+            logger.warning("ingest_xlsx: batch %s vanished", batch_id)
+            for out in saved or ():
+                Path(out).unlink(missing_ok=True)
+            return 0
+        rejections = RejectionLog(path.with_name(REJECTIONS_FILE))
+        if saved is not None:
+            records = iter_saved_sheets(sheets, saved, rejections)
+        elif sheets:
+            records = iter_workbook_records(path, sheets, rejections)
+        else:
+            records = iter_xlsx_records(path, rejections)
+        if not update:
+            return await ingest_into_batch(db, batch, records, rejections)
+
+        counts = await upsert_into_batch(db, batch, records, rejections, content_sha256)
+        logger.info("ingest_xlsx: batch %s updated %s", batch_id, counts)
+        return counts["inserted"] + counts["updated"]
+
+
+@celery.task(name="cards.ingest_xlsx")
+def ingest_xlsx(
+    batch_id: str,
+    path: str,
+    sheets: List[str] | None = None,
+    update: bool = False,
+    content_sha256: str | None = None,
+) -> int | None:
+    """
+    Parse a spooled XLSX upload and insert its rows into the batch.
+
+    *sheets* selects sheets by name (``["*"]`` for all); by default only the
+    active sheet is read. Dropped rows are reported in ``rejections.bin``
+    next to the upload. With *update* the rows are merged into the batch's
+    existing records (see ``upsert_into_batch``, which also stores
+    *content_sha256* once the merge is in) and the number of inserted plus
+    changed rows is returned.
+
+    Several sheets are parsed in parallel by a chord of ``parse_sheet``
+    tasks, one per sheet, and ingested by ``ingest_sheets``, which then
+    returns the count; this task returns None in that case.
+    """
+    if sheets:
+        try:
+            names, strict = sheet_names(Path(path), sheets)
+        except ValueError:
+            names = []  # raised again below, where it fails the batch
+        if len(names) > 1:
+            saved = [f"{path}.sheet{ix}" for ix in range(len(names))]
+            chord(
+                parse_sheet.s(path, name, strict, out) for name, out in zip(names, saved)
+            )(ingest_sheets.s(batch_id, path, names, saved, update, content_sha256))
+            return None
+    return asyncio.run(
+        _ingest_xlsx(
+            uuid.UUID(batch_id), Path(path), sheets, update, content_sha256=content_sha256
+        )
+    )
+
+
+@celery.task(name="cards.parse_sheet")
+def parse_sheet(path: str, sheet: str, strict: bool, out: str) -> None:
+    """Parse one sheet of ``ingest_xlsx``'s workbook into *out* (see ``save_sheet``)."""
+    save_sheet(path, sheet, strict, out)
+
+
+@celery.task(name="cards.ingest_sheets")
+def ingest_sheets(
+    _parsed: list,
+    batch_id: str,
+    path: str,
+    names: List[str],
+    saved: List[str],
+    update: bool,
+    content_sha256: str | None = None,
+) -> int:
+    """Chord callback of ``ingest_xlsx``: ingest the sheets ``parse_sheet`` saved, in order."""
+    return asyncio.run(
+        _ingest_xlsx(uuid.UUID(batch_id), Path(path), names, update, saved, content_sha256)
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# Card rendering
+# ──────────────────────────────────────────────────────────────
+def _thumbnail(src, card_path: Path) -> bool:
+    """Preview for one card; a failure is logged, never fatal to the card."""
+    try:
+        write_thumbnail(src, thumb_path(card_path))
+    except Exception:  # noqa: BLE001
+        logger.exception("thumbnail for %s failed", card_path)
+        return False
+    return True
+
+
+@celery.task(name="cards.make_thumbnails")
+def make_thumbnails(card_filenames: List[str]) -> int:
+    """Write ``<uuid>.thumb.webp`` next to uploaded cards (paths relative to CARDS_ROOT)."""
+    return sum(_thumbnail(CARDS_ROOT / rel, CARDS_ROOT / rel) for rel in card_filenames)
+
+
+async def _claim_for_render(batch_id: uuid.UUID) -> List[str]:
+    """Flip the batch's renderable records to ``generating`` and return their ids."""
+    cols = CollabCard.__table__.c
+    stale = dt.datetime.utcnow() - RENDER_STALE
+    async with WorkerSessionLocal() as db:
+        res = await db.execute(
+            update(CollabCard.__table__)
+            .where(
+                cols.batch_id == batch_id,
+                or_(
+                    cols.status.in_([RecordStatus.pending, RecordStatus.failed]),
+                    (cols.status == RecordStatus.generating) & (cols.updated_at < stale),
+                ),
+            )
+            .values(status=RecordStatus.generating)
+            .returning(cols.id)
+        )
+        ids = [str(rec_id) for rec_id in res.scalars()]
+        if ids:
+            await touch_batch(db, batch_id)
+        await db.commit()
+        if ids:
+            await publish_batch(db, batch_id)
+    return ids
+
+
+async def _render_chunk(batch_id: uuid.UUID, ids: List[uuid.UUID]) -> int:
+    cols = CollabCard.__table__.c
+    async with WorkerSessionLocal() as db:
+        batch = await db.get(Batch, batch_id)
+        if batch is None:
+            logger.warning("render_chunk: batch %s vanished", batch_id)
+            return 0
+        company = await db.get(Company, batch.company_id) if batch.company_id else None
+        company_data = (
+            {"name": company.name, "phone_prefix": company.phone_prefix, "web": company.web}
+            if company
+            else {}
+        )
+
+        # records re-uploaded or edited since the claim are no longer "generating"
+        rows = (
+            await db.execute(
+                select(cols.id, *(cols[f] for f in RECORD_FIELDS)).where(
+                    cols.batch_id == batch_id,
+                    cols.id.in_(ids),
+                    cols.status == RecordStatus.generating,
+                )
+            )
+        ).mappings().all()
+
+        template = template_for(batch.company_id)
+        dest_dir = card_dest_dir(batch)
+        saved: dict[uuid.UUID, StoredCard] = {}
+        failed: List[uuid.UUID] = []
+        for row in rows:
+            dest_path = dest_dir / f"{row['id']}.png"
+            try:
+                card = render_card(template, row, company_data)
+                saved[row["id"]] = store_card_bytes(encode_card(card), dest_path)
+            except Exception:  # noqa: BLE001 – one bad record must not sink the chunk
+                logger.exception("render_chunk: record %s failed", row["id"])
+                failed.append(row["id"])
+                continue
+            _thumbnail(card, dest_path)
+
+        await attach_cards(db, batch, saved)
+        if failed:
+            await db.execute(
+                update(CollabCard.__table__)
+                .where(cols.id.in_(failed))
+                .values(status=RecordStatus.failed)
+            )
+            await touch_batch(db, batch_id)
+        await db.commit()
+        await publish_batch(db, batch_id)
+    if saved:
+        optimize_cards.delay(str(batch_id), [str(rec_id) for rec_id in saved])
+    return len(saved)
+
+
+@celery.task(name="cards.render_chunk")
+def render_chunk(batch_id: str, ids: List[str]) -> int:
+    """Render and attach the cards of *ids*; returns how many were written."""
+    return asyncio.run(_render_chunk(uuid.UUID(batch_id), [uuid.UUID(i) for i in ids]))
+
+
+@celery.task(name="cards.render_batch")
+def render_batch(batch_id: str) -> int:
+    """
+    Render every pending or failed card of a batch.
+
+    Records are claimed (``generating``) here and fanned out as a group of
+    ``render_chunk`` tasks of ``RENDER_CHUNK`` records, so every worker
+    process takes a share; each keeps fonts and templates cached between
+    chunks. Cards land where ``/cards/upload`` puts them and count towards
+    the batch's progress the same way. Returns the number of records queued.
+    """
+    ids = asyncio.run(_claim_for_render(uuid.UUID(batch_id)))
+    if ids:
+        group(
+            render_chunk.s(batch_id, ids[start : start + RENDER_CHUNK])
+            for start in range(0, len(ids), RENDER_CHUNK)
+        ).apply_async()
+    return len(ids)
+
+
+# ──────────────────────────────────────────────────────────────
+# Card optimization
+# ──────────────────────────────────────────────────────────────
+def _optimize_rows(rows, done: set[str]) -> List[dict]:
+    """
+    Recompress each row's card file in place (via the blob store) and return
+    the record updates. Identical cards share a blob, so each distinct one is
+    optimized once; blobs in *done* are known results and only measured.
+    """
+    results: dict[str, tuple[int, bytes | None]] = {}
+    updates = []
+    for row in rows:
+        path = CARDS_ROOT / row.card_filename
+        try:
+            # replaced since the record was read: that card gets its own pass
+            if row.card_sha256 and not os.path.samefile(path, blob_path(row.card_sha256)):
+                continue
+            if row.card_sha256 in done:
+                size, smaller = path.stat().st_size, None
+            elif row.card_sha256 in results:
+                size, smaller = results[row.card_sha256]
+            else:
+                data = path.read_bytes()
+                size, smaller = len(data), optimize_png(data)
+                if row.card_sha256:
+                    results[row.card_sha256] = size, smaller
+            card = store_card_bytes(smaller, path) if smaller else None
+        except FileNotFoundError:
+            continue
+        except Exception:  # noqa: BLE001 – the card stays as it was
+            logger.exception("optimize_cards: record %s failed", row.id)
+            continue
+        updates.append(
+            {
+                "b_id": row.id,
+                "b_generated_at": row.generated_at,
+                "b_sha": card.sha256 if card else row.card_sha256,
+                "b_original": size,
+                "b_bytes": len(smaller) if smaller else size,
+            }
+        )
+    return updates
+
+
+async def _optimize_cards(batch_id: uuid.UUID, ids: List[uuid.UUID]) -> int:
+    cols = CollabCard.__table__.c
+    async with WorkerSessionLocal() as db:
+        rows = (
+            await db.execute(
+                select(cols.id, cols.card_filename, cols.card_sha256, cols.generated_at).where(
+                    cols.batch_id == batch_id,
+                    cols.id.in_(ids),
+                    cols.card_filename.is_not(None),
+                    cols.card_bytes_original.is_(None),
+                )
+            )
+        ).all()
+        if not rows:
+            return 0
+
+        # a blob some record already went through is optimizer output (or
+        # could not be improved), so it needs no second pass
+        shas = list({row.card_sha256 for row in rows if row.card_sha256})
+        done = set(
+            (
+                await db.execute(
+                    select(cols.card_sha256)
+                    .where(cols.card_sha256.in_(shas), cols.card_bytes_original.is_not(None))
+                    .distinct()
+                )
+            ).scalars()
+        ) if shas else set()
+
+        updates = _optimize_rows(rows, done)
+        if updates:
+            # generated_at guards against a card attached since the rows were read
+            await db.execute(
+                update(CollabCard.__table__)
+                .where(cols.id == bindparam("b_id"), cols.generated_at == bindparam("b_generated_at"))
+                .values(
+                    card_sha256=bindparam("b_sha"),
+                    card_bytes_original=bindparam("b_original"),
+                    card_bytes=bindparam("b_bytes"),
+                ),
+                updates,
+            )
+            await touch_batch(db, batch_id)
+            await db.commit()
+    return sum(u["b_original"] - u["b_bytes"] for u in updates)
+
+
+@celery.task(name="cards.optimize_cards")
+def optimize_cards(batch_id: str, ids: List[str]) -> int:
+    """
+    Losslessly recompress the stored cards of *ids* (see ``optimize_png``)
+    and record their size before and after. Records already done, and cards
+    that are themselves an optimizer output, are skipped. Returns bytes saved.
+    """
+    return asyncio.run(_optimize_cards(uuid.UUID(batch_id), [uuid.UUID(i) for i in ids]))
+
+
+# ──────────────────────────────────────────────────────────────
+# Card blob store
+# ──────────────────────────────────────────────────────────────
+@celery.task(name="cards.collect_blobs")
+def collect_card_blobs() -> int:
+    """Delete card blobs no record path links to any more; returns how many."""
+    removed, freed = collect_blobs()
+    logger.info("collect_blobs: removed %d blobs, %d bytes", removed, freed)
+    return removed
+
+
+# ──────────────────────────────────────────────────────────────
+# Resumable upload sessions
+# ──────────────────────────────────────────────────────────────
+@celery.task(name="cards.collect_uploads")
+def collect_upload_sessions() -> int:
+    """Delete expired resumable upload sessions; returns how many."""
+    removed, freed = collect_uploads()
+    logger.info("collect_uploads: removed %d sessions, %d bytes", removed, freed)
+    return removed
+
+
+celery.conf.beat_schedule = {
+    "collect-card-blobs": {"task": "cards.collect_blobs", "schedule": 6 * 3600},
+    "collect-upload-sessions": {"task": "cards.collect_uploads", "schedule": 3600},
+}
@@ -0,0 +1,60 @@
+# backend/app/services/upload_sessions.py
+"""
+Where resumable upload sessions live on disk, and the sweep that removes
+the ones nobody came back for.
+
+A session is ``PARTIAL_ROOT/<id>/`` with ``meta.json`` (its ``expires_at``
+slides forward on every append) and ``data``. The API only notices an
+expired session when a client touches it again, so abandoned ones are
+collected here by the worker (see ``cards.collect_uploads``).
+"""
+from __future__ import annotations
+
+import datetime as dt
+import fcntl
+import json
+import shutil
+import time
+from pathlib import Path
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+PARTIAL_ROOT = Path(settings.upload_dir or "/data/uploads").joinpath("partial")
+
+
+def _expired(root: Path, now: dt.datetime) -> bool:
+    try:
+        meta = json.loads((root / "meta.json").read_text())
+        return dt.datetime.fromisoformat(meta["expires_at"]) < now
+    except (FileNotFoundError, ValueError, KeyError):
+        # no readable sidecar: a session that died while being created
+        age = time.time() - root.stat().st_mtime
+        return age > settings.resumable_ttl_hours * 3600
+
+
+def collect_uploads() -> tuple[int, int]:
+    """
+    Delete expired sessions that no request is writing to.
+    Returns ``(sessions removed, bytes freed)``.
+    """
+    removed = freed = 0
+    now = dt.datetime.utcnow()
+    for root in PARTIAL_ROOT.glob("*"):
+        try:
+            if not root.is_dir() or not _expired(root, now):
+                continue
+            with (root / "data").open("rb") as data:
+                # a PATCH holds this lock while it streams; leave that session be
+                fcntl.flock(data, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                size = data.seek(0, 2)
+                shutil.rmtree(root, ignore_errors=True)
+        except BlockingIOError:
+            continue
+        except FileNotFoundError:
+            shutil.rmtree(root, ignore_errors=True)
+            continue
+        removed += 1
+        freed += size
+    return removed, freed
@@ -0,0 +1,178 @@
+# backend/app/services/zipstream.py
+"""
+ZIP archives streamed straight from files on disk, with byte-range access.
+
+Every member is STORED (cards are PNGs; deflating them again buys nothing),
+so the archive's exact layout and length follow from the member names and
+sizes alone. That makes any byte range computable without building the
+archive: a local record is read from its one file, the central directory is
+generated entry by entry. Only one member's data is in memory at a time.
+
+CRC-32s are needed for the headers; they are computed from the data as it
+is read and cached per process by ``(path, size, mtime)``, so a full
+download reads each file once, and a resume that only needs the central
+directory re-reads the files without sending them.
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+_LOCAL = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL = struct.Struct("<IHHHHHHIIIHHHHHII")
+_ZIP64_EXTRA = struct.Struct("<HHQ")
+_ZIP64_END = struct.Struct("<IQHHIIQQQQ")
+_ZIP64_LOCATOR = struct.Struct("<IIQI")
+_END = struct.Struct("<IHHHHIIH")
+
+_FLAG_UTF8 = 0x0800
+_MAX32 = 0xFFFFFFFF
+_MAX16 = 0xFFFF
+_DOS_EPOCH = 315532800  # 1980-01-01, the earliest DOS timestamp
+
+_CRCS: dict[tuple[str, int, int], int] = {}
+_CRC_CACHE_MAX = 500_000
+
+
+@dataclass(frozen=True)
+class ZipMember:
+    name: str
+    path: Path
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_path(cls, path: Path, name: str | None = None) -> "ZipMember":
+        st = path.stat()
+        return cls(name or path.name, path, st.st_size, st.st_mtime_ns)
+
+
+def _dos_datetime(mtime_ns: int) -> tuple[int, int]:
+    t = time.gmtime(max(mtime_ns // 1_000_000_000, _DOS_EPOCH))
+    return (
+        (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+        ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday,
+    )
+
+
+class StoredZip:
+    """A STORED (uncompressed) ZIP of *members*, served by byte range."""
+
+    def __init__(self, members: Sequence[ZipMember]) -> None:
+        self.members: List[ZipMember] = list(members)
+        self._names = [m.name.encode() for m in self.members]
+
+        self._offsets: List[int] = []  # local record start per member
+        pos = 0
+        for m, name in zip(self.members, self._names):
+            if m.size >= _MAX32:
+                raise ValueError(f"{m.name}: members of 4 GiB or more are not supported")
+            self._offsets.append(pos)
+            pos += _LOCAL.size + len(name) + m.size
+        self._cd_offset = pos
+
+        self._cd_lengths = [
+            _CENTRAL.size + len(name) + (_ZIP64_EXTRA.size if off >= _MAX32 else 0)
+            for name, off in zip(self._names, self._offsets)
+        ]
+        self._cd_size = sum(self._cd_lengths)
+        self._zip64 = (
+            len(self.members) > _MAX16
+            or self._cd_offset >= _MAX32
+            or self._cd_size >= _MAX32
+        )
+        self.size = self._cd_offset + self._cd_size + len(self._end_records())
+
+    @property
+    def etag(self) -> str:
+        """Strong validator: changes whenever any member's name, size or mtime does."""
+        h = hashlib.sha1()
+        for m in self.members:
+            h.update(f"{m.name}\0{m.size}\0{m.mtime_ns}\n".encode())
+        return f'"{h.hexdigest()}"'
+
+    # ── per-member pieces ─────────────────────────────────────
+    def _read(self, i: int) -> bytes:
+        m = self.members[i]
+        data = m.path.read_bytes()
+        if len(data) != m.size:
+            raise RuntimeError(f"{m.name} changed while the archive was being sent")
+        if len(_CRCS) >= _CRC_CACHE_MAX:
+            _CRCS.clear()
+        _CRCS[(str(m.path), m.size, m.mtime_ns)] = zlib.crc32(data)
+        return data
+
+    def _crc(self, i: int) -> int:
+        m = self.members[i]
+        crc = _CRCS.get((str(m.path), m.size, m.mtime_ns))
+        if crc is None:
+            self._read(i)
+            crc = _CRCS[(str(m.path), m.size, m.mtime_ns)]
+        return crc
+
+    def _local_record(self, i: int) -> bytes:
+        m, name = self.members[i], self._names[i]
+        data = self._read(i)
+        dos_time, dos_date = _dos_datetime(m.mtime_ns)
+        header = _LOCAL.pack(
+            0x04034B50, 20, _FLAG_UTF8, 0, dos_time, dos_date,
+            self._crc(i), m.size, m.size, len(name), 0,
+        )
+        return header + name + data
+
+    def _central_record(self, i: int) -> bytes:
+        m, name, offset = self.members[i], self._names[i], self._offsets[i]
+        extra = _ZIP64_EXTRA.pack(0x0001, 8, offset) if offset >= _MAX32 else b""
+        dos_time, dos_date = _dos_datetime(m.mtime_ns)
+        return _CENTRAL.pack(
+            0x02014B50, 45 if extra else 20, 45 if extra else 20, _FLAG_UTF8, 0,
+            dos_time, dos_date, self._crc(i), m.size, m.size,
+            len(name), len(extra), 0, 0, 0, 0o100644 << 16, min(offset, _MAX32),
+        ) + name + extra
+
+    def _end_records(self) -> bytes:
+        n, cd_size, cd_offset = len(self.members), self._cd_size, self._cd_offset
+        out = b""
+        if self._zip64:
+            out += _ZIP64_END.pack(
+                0x06064B50, _ZIP64_END.size - 12, 45, 45, 0, 0, n, n, cd_size, cd_offset
+            )
+            out += _ZIP64_LOCATOR.pack(0x07064B50, 0, cd_offset + cd_size, 1)
+        return out + _END.pack(
+            0x06054B50, 0, 0, min(n, _MAX16), min(n, _MAX16),
+            min(cd_size, _MAX32), min(cd_offset, _MAX32), 0,
+        )
+
+    # ── streaming ─────────────────────────────────────────────
+    def iter_range(self, start: int = 0, stop: int | None = None) -> Iterator[bytes]:
+        """Yield the archive's bytes ``[start, stop)`` (blocking file reads)."""
+        stop = self.size if stop is None else min(stop, self.size)
+        pos = start
+
+        if pos < self._cd_offset:
+            i = bisect.bisect_right(self._offsets, pos) - 1
+            while i < len(self.members) and pos < stop:
+                base = self._offsets[i]
+                chunk = self._local_record(i)[pos - base : stop - base]
+                yield chunk
+                pos += len(chunk)
+                i += 1
+
+        base = self._cd_offset
+        for i, length in enumerate(self._cd_lengths):
+            if pos >= stop:
+                return
+            if base + length > pos:
+                chunk = self._central_record(i)[pos - base : stop - base]
+                yield chunk
+                pos += len(chunk)
+            base += length
+
+        if pos < stop:
+            yield self._end_records()[pos - base : stop - base]
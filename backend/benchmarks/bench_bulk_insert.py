@@ -0,0 +1,80 @@
+# backend/benchmarks/bench_bulk_insert.py
+"""
+Rows/sec for CollabCard inserts: ORM ``add_all`` vs. the bulk writer.
+
+    cd backend
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_bulk_insert --rows 100000
+
+Each run creates a throw-away batch, inserts synthetic rows and deletes them
+again, so it is safe against a dev database.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete
+
+from app.core.database import AsyncSessionLocal
+from app.models import Batch, CollabCard
+from app.services.bulk import bulk_insert_collabcards
+from app.services.ingest import BATCH_SIZE
+
+
+def _rows(n: int):
+    for i in range(n):
+        yield {
+            "full_name": f"Colaborador {i}",
+            "email": f"colaborador{i}@example.com",
+            "mobile_phone": f"+506 8{i:07d}",
+            "job_title": "Analista",
+            "office_phone": None,
+        }
+
+
+async def _orm(db, batch: Batch, n: int) -> None:
+    buffer: list[CollabCard] = []
+    for rec in _rows(n):
+        buffer.append(CollabCard(batch_id=batch.id, company_id=None, created_by=None, **rec))
+        if len(buffer) >= BATCH_SIZE:
+            db.add_all(buffer)
+            buffer.clear()
+    db.add_all(buffer)
+    await db.commit()
+
+
+async def _bulk(db, batch: Batch, n: int) -> None:
+    await bulk_insert_collabcards(
+        db, _rows(n), batch_id=batch.id, company_id=None, created_by=None
+    )
+    await db.commit()
+
+
+async def _run(label: str, fn, n: int) -> None:
+    async with AsyncSessionLocal() as db:
+        batch = Batch(original_filename=f"bench-{label}")
+        db.add(batch)
+        await db.commit()
+
+        t0 = time.perf_counter()
+        await fn(db, batch, n)
+        elapsed = time.perf_counter() - t0
+        print(f"{label:>6}: {n:>8} rows in {elapsed:7.2f}s  → {n / elapsed:>10,.0f} rows/s")
+
+        await db.execute(delete(CollabCard).where(CollabCard.batch_id == batch.id))
+        await db.delete(batch)
+        await db.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    await _run("orm", _orm, args.rows)
+    await _run("bulk", _bulk, args.rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
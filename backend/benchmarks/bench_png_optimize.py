@@ -0,0 +1,70 @@
+# backend/benchmarks/bench_png_optimize.py
+"""
+Bytes saved and CPU cost per card of the optimize stage (``optimize_png``).
+
+    cd backend
+    python -m benchmarks.bench_png_optimize --cards 200
+    python -m benchmarks.bench_png_optimize --dir uploads/cards/<company>/<batch>
+
+Without ``--dir`` the cards are rendered like the worker does (same
+template, fonts and zlib level), so the numbers describe server-rendered
+cards; point ``--dir`` at a batch folder to measure uploaded ones.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Iterator
+
+from app.services.render import encode_card, optimize_png, render_card, template_for
+
+COMPANY = {"name": "Compañía Ejemplo S.A.", "phone_prefix": "+506", "web": "www.ejemplo.cr"}
+
+
+def _rendered(n: int) -> Iterator[bytes]:
+    template = template_for(None)
+    for i in range(n):
+        record = {
+            "full_name": f"Colaborador Núñez {i}",
+            "email": f"colaborador{i}@example.com",
+            "mobile_phone": f"8{i:07d}",
+            "job_title": "Analista de Operaciones",
+            "office_phone": "2222-0000",
+        }
+        yield encode_card(render_card(template, record, COMPANY))
+
+
+def _from_dir(folder: Path) -> Iterator[bytes]:
+    for path in sorted(folder.glob("*.png")):
+        yield path.read_bytes()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--dir", type=Path, help="measure these PNGs instead of rendering")
+    args = parser.parse_args()
+
+    before = after = improved = 0
+    cpu_ms: list[float] = []
+    for data in _from_dir(args.dir) if args.dir else _rendered(args.cards):
+        t0 = time.process_time()
+        smaller = optimize_png(data)
+        cpu_ms.append((time.process_time() - t0) * 1000)
+        before += len(data)
+        after += len(smaller) if smaller else len(data)
+        improved += smaller is not None
+
+    n = len(cpu_ms)
+    if not n:
+        raise SystemExit("no cards")
+    print(f"cards:        {n} ({improved} improved)")
+    print(f"bytes:        {before:,} → {after:,}  (saved {before - after:,}, {100 * (before - after) / before:.1f}%)")
+    print(f"per card:     {before / n:,.0f} → {after / n:,.0f} bytes")
+    print(f"CPU per card: mean {statistics.fmean(cpu_ms):.1f} ms, p95 {sorted(cpu_ms)[min(n - 1, int(n * 0.95))]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# backend/benchmarks/check_query_plans.py
+"""
+Plan check for the hot batch / record / user queries: none may fall back to
+a sequential scan on a big table.
+
+    cd backend
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.check_query_plans --records 200000
+
+Seeds throw-away companies, batches, records and users (``--seed-only`` /
+``--keep`` leave them in place), runs ``ANALYZE`` and ``EXPLAIN`` on each
+query the endpoints and the worker issue, and exits 1 if any of them can
+only be answered by a ``Seq Scan`` on ``collabcards``, ``batches`` or
+``users`` (one the planner merely prefers on a small table is reported,
+not failed). The statements are built the same way the app builds them,
+so a change there that loses its index shows up here. Meant for
+migrations that touch these tables; ``tests/test_query_plans.py`` runs
+the same check under pytest.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import sys
+import uuid
+from typing import Iterator, NamedTuple
+
+from sqlalchemy import String, delete, func, or_, select, text, tuple_, update
+from sqlalchemy.sql import Executable
+
+from app.api.endpoints.collab_cards import _in_flight
+from app.core.database import AsyncSessionLocal
+from app.models import Batch, CollabCard, Company, User
+from app.models.enums import RecordStatus
+from app.services.bulk import bulk_insert_collabcards
+
+CHECKED_TABLES = {"collabcards", "batches", "users"}
+PREFIX = "plan-check"
+
+
+def _rows(n: int) -> Iterator[dict]:
+    for i in range(n):
+        yield {
+            "full_name": f"Colaborador {i}",
+            "email": f"colaborador{i}@example.com",
+            "mobile_phone": f"+506 8{i:07d}",
+            "job_title": "Analista",
+            "office_phone": None,
+        }
+
+
+async def _seed(companies: int, batches: int, records: int) -> None:
+    """*batches* per company, *records* spread over all of them."""
+    per_batch = max(1, records // (companies * batches))
+    async with AsyncSessionLocal() as db:
+        for c in range(companies):
+            company = Company(name=f"{PREFIX}-{uuid.uuid4().hex[:8]}-{c}")
+            db.add(company)
+            await db.flush()
+            db.add_all(
+                User(
+                    email=f"{PREFIX}-{uuid.uuid4().hex}@example.com",
+                    hashed_password="!",
+                    company_id=company.id,
+                )
+                for _ in range(20)
+            )
+            for b in range(batches):
+                batch = Batch(
+                    company_id=company.id,
+                    original_filename=f"{PREFIX}-{b}.xlsx",
+                    total_records=per_batch,
+                    # most batches are done; the in-flight index must stay selective
+                    processed_records=per_batch if b % 10 else 0,
+                )
+                db.add(batch)
+                await db.flush()
+                await bulk_insert_collabcards(
+                    db, _rows(per_batch), batch_id=batch.id, company_id=company.id, created_by=None
+                )
+                if b % 10:
+                    await db.execute(
+                        update(CollabCard.__table__)
+                        .where(CollabCard.batch_id == batch.id)
+                        .values(
+                            status=RecordStatus.generated,
+                            card_sha256=func.md5(func.random().cast(String)),
+                        )
+                    )
+            await db.commit()
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("ANALYZE collabcards, batches, users"))
+        await db.commit()
+
+
+async def _cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        ids = select(Company.id).where(Company.name.like(f"{PREFIX}-%")).scalar_subquery()
+        await db.execute(delete(CollabCard).where(CollabCard.company_id.in_(ids)))
+        await db.execute(delete(Batch).where(Batch.company_id.in_(ids)))
+        await db.execute(delete(User).where(User.company_id.in_(ids)))
+        await db.execute(delete(Company).where(Company.name.like(f"{PREFIX}-%")))
+        await db.commit()
+
+
+async def _queries() -> dict[str, Executable]:
+    async with AsyncSessionLocal() as db:
+        batch = (
+            await db.execute(
+                select(Batch)
+                .where(Batch.original_filename.like(f"{PREFIX}-%"))
+                .order_by(Batch.total_records.desc())
+                .limit(1)
+            )
+        ).scalar_one()
+        ids = (
+            await db.execute(select(CollabCard.id).where(CollabCard.batch_id == batch.id).limit(500))
+        ).scalars().all()
+
+    cols = CollabCard.__table__.c
+    now = dt.datetime.utcnow()
+    page = select(CollabCard).where(CollabCard.batch_id == batch.id)
+    return {
+        # GET /collabcards/batch/{id}/records, first page and a later one
+        "records page": page.order_by(CollabCard.created_at, CollabCard.id).limit(501),
+        "records keyset page": page.where(
+            tuple_(CollabCard.created_at, CollabCard.id)
+            # typed: EXPLAIN gets the cursor as literals, not as bound parameters
+            > tuple_(now - dt.timedelta(days=1), ids[-1], types=[cols.created_at.type, cols.id.type])
+        ).order_by(CollabCard.created_at, CollabCard.id).limit(501),
+        # GET /collabcards/pending-batches
+        "pending batches": select(Batch)
+        .where(_in_flight(batch.company_id))
+        .order_by(Batch.created_at.desc()),
+        # batch listing per company
+        "company batches": select(Batch)
+        .where(Batch.company_id == batch.company_id)
+        .order_by(Batch.created_at.desc()),
+        # card uploads (card_store.existing_ids)
+        "existing ids": select(CollabCard.id).where(
+            CollabCard.batch_id == batch.id, CollabCard.id.in_(ids)
+        ),
+        # render_batch claim
+        "render claim": update(CollabCard.__table__)
+        .where(
+            cols.batch_id == batch.id,
+            or_(
+                cols.status.in_([RecordStatus.pending, RecordStatus.failed]),
+                (cols.status == RecordStatus.generating) & (cols.updated_at < now),
+            ),
+        )
+        .values(status=RecordStatus.generating)
+        .returning(cols.id),
+        # bulk._refresh_counters
+        "batch counters": select(
+            func.count(), func.count().filter(cols.status == RecordStatus.generated)
+        ).where(cols.batch_id == batch.id),
+        # optimize_cards: blobs some record already processed
+        "optimized blobs": select(cols.card_sha256).where(
+            cols.card_sha256.in_(["0" * 64, "f" * 64]), cols.card_bytes_original.is_not(None)
+        ),
+        # GET /users for a company admin
+        "company users": select(User).where(User.company_id == batch.company_id),
+    }
+
+
+def _seq_scans(plan: dict) -> Iterator[str]:
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from _seq_scans(child)
+
+
+def _index_names(plan: dict) -> Iterator[str]:
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", ()):
+        yield from _index_names(child)
+
+
+class PlanResult(NamedTuple):
+    cost: float
+    preferred: list[str]  # tables the planner chose to scan sequentially
+    unindexed: list[str]  # ... and still does with enable_seqscan off: no index fits
+    indexes: list[str]    # indexes of the plan, the enable_seqscan off one if it came to that
+
+
+async def explain_queries() -> dict[str, PlanResult]:
+    """
+    EXPLAIN every query of :func:`_queries` against the seeded tables. A
+    query whose plan has a ``Seq Scan`` is planned again with
+    ``enable_seqscan`` off, which tells a small table the planner rightly
+    reads whole from a query no index can serve.
+    """
+    results = {}
+    async with AsyncSessionLocal() as db:
+        conn = await db.connection()
+
+        async def plan_of(sql: str) -> dict:
+            raw = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+            return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+        for label, stmt in (await _queries()).items():
+            sql = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+            plan = indexed = await plan_of(sql)
+            preferred = sorted(set(_seq_scans(plan)))
+            if preferred:
+                await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                indexed = await plan_of(sql)
+                await conn.exec_driver_sql("SET LOCAL enable_seqscan = on")
+            results[label] = PlanResult(
+                plan["Total Cost"],
+                preferred,
+                sorted(set(_seq_scans(indexed))),
+                sorted(set(_index_names(indexed))),
+            )
+        await db.rollback()
+    return results
+
+
+async def _check() -> int:
+    results = await explain_queries()
+    for label, r in results.items():
+        if r.unindexed:
+            status = f"SEQ SCAN on {', '.join(r.unindexed)}"
+        elif r.preferred:
+            status = f"ok (seq scan on small {', '.join(r.preferred)})"
+        else:
+            status = "ok"
+        print(f"{label:<22} {status:<40} cost {r.cost:,.0f}")
+    return sum(bool(r.unindexed) for r in results.values())
+
+
+async def _main(args: argparse.Namespace) -> int:
+    await _cleanup()
+    await _seed(args.companies, args.batches, args.records)
+    if args.seed_only:
+        return 0
+    try:
+        return await _check()
+    finally:
+        if not args.keep:
+            await _cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--batches", type=int, default=20, help="per company")
+    parser.add_argument("--records", type=int, default=200_000, help="in total")
+    parser.add_argument("--seed-only", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = parser.parse_args()
+    failures = asyncio.run(_main(args))
+    if failures:
+        print(f"{failures} quer{'y' if failures == 1 else 'ies'} without an index", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""query path indexes
+
+Revision ID: c4d19e7a2b60
+Revises: b86f0d3e5a17
+Create Date: 2026-10-18 10:26:03.774512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d19e7a2b60'
+down_revision: Union[str, None] = 'b86f0d3e5a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY: collabcards can be large, and a plain CREATE INDEX would
+    # block writes (ingest, card uploads) for the whole build. It can't run
+    # in a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_collabcards_batch_id_created_at_id', 'collabcards', ['batch_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_collabcards_company_id_created_at', 'collabcards', ['company_id', 'created_at'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_collabcards_batch_id_unfinished', 'collabcards', ['batch_id', 'status'], unique=False, postgresql_where=sa.text("status <> 'generated'"), postgresql_concurrently=True)
+        op.create_index('ix_batches_company_id_created_at', 'batches', ['company_id', 'created_at'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_batches_in_flight', 'batches', ['company_id', 'created_at'], unique=False, postgresql_where=sa.text("status = 'processing' OR processed_records < total_records"), postgresql_concurrently=True)
+        op.create_index(op.f('ix_users_company_id'), 'users', ['company_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_users_company_id'), table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_batches_in_flight', table_name='batches', postgresql_concurrently=True)
+        op.drop_index('ix_batches_company_id_created_at', table_name='batches', postgresql_concurrently=True)
+        op.drop_index('ix_collabcards_batch_id_unfinished', table_name='collabcards', postgresql_concurrently=True)
+        op.drop_index('ix_collabcards_company_id_created_at', table_name='collabcards', postgresql_concurrently=True)
+        op.drop_index('ix_collabcards_batch_id_created_at_id', table_name='collabcards', postgresql_concurrently=True)
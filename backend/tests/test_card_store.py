@@ -0,0 +1,157 @@
+# backend/tests/test_card_store.py
+"""
+Card blob reference counting: a blob is collectable exactly when no record's
+card path links to it any more.
+
+Needs a database migrated to head, and is skipped otherwise:
+
+    cd backend
+    DATABASE_URL=... SECRET_KEY=... python -m pytest tests/test_card_store.py
+
+Cards and blobs go to a temporary directory, not the configured UPLOAD_DIR.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+
+import pytest
+
+if not os.environ.get("DATABASE_URL"):
+    pytest.skip("needs DATABASE_URL", allow_module_level=True)
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.core.database import WorkerSessionLocal  # noqa: E402
+from app.models import Batch, CollabCard  # noqa: E402
+from app.models.enums import BatchStatus  # noqa: E402
+from app.services import card_store  # noqa: E402
+from app.services.bulk import ingest_into_batch, upsert_into_batch  # noqa: E402
+from app.services.ingest import BATCH_SIZE, RECORD_FIELDS  # noqa: E402
+
+ROWS = [
+    ("Ana Pérez", "ana@example.com", None, "Analista", None),
+    ("Luis Mora", "luis@example.com", None, "Técnico", None),
+]
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(card_store, "CARDS_ROOT", tmp_path / "cards")
+    monkeypatch.setattr(card_store, "BLOBS_ROOT", tmp_path / "blobs")
+    card_store.BLOBS_ROOT.mkdir()
+
+
+async def _batch_with_cards(card: bytes) -> tuple[uuid.UUID, dict[str, card_store.StoredCard]]:
+    """A batch of ROWS whose records all carry the same card."""
+    async with WorkerSessionLocal() as db:
+        batch = Batch(status=BatchStatus.processing, original_filename="t.csv")
+        db.add(batch)
+        await db.commit()
+        await ingest_into_batch(db, batch, list(ROWS))
+
+        rows = (
+            await db.execute(
+                CollabCard.__table__.select().where(CollabCard.batch_id == batch.id)
+            )
+        ).mappings().all()
+        dest_dir = card_store.card_dest_dir(batch)
+        saved = {
+            row["id"]: card_store.store_card_bytes(card, dest_dir / f"{row['id']}.png")
+            for row in rows
+        }
+        await card_store.attach_cards(db, batch, saved)
+        await db.commit()
+        return batch.id, {row["email"]: saved[row["id"]] for row in rows}
+
+
+async def _merge(batch_id: uuid.UUID, rows: list[tuple]) -> dict[str, int]:
+    async with WorkerSessionLocal() as db:
+        return await upsert_into_batch(db, await db.get(Batch, batch_id), rows)
+
+
+async def _drop(batch_id: uuid.UUID) -> None:
+    async with WorkerSessionLocal() as db:
+        await db.execute(delete(CollabCard).where(CollabCard.batch_id == batch_id))
+        await db.execute(delete(Batch).where(Batch.id == batch_id))
+        await db.commit()
+
+
+def _changed(row: tuple) -> tuple:
+    values = dict(zip(RECORD_FIELDS, row))
+    values["job_title"] += " (corregido)"
+    return tuple(values[f] for f in RECORD_FIELDS)
+
+
+def test_blob_is_collected_once_its_last_record_is_reset():
+    batch_id, cards = asyncio.run(_batch_with_cards(b"\x89PNG shared card"))
+    try:
+        blob = card_store.blob_path(cards["ana@example.com"].sha256)
+        assert blob.stat().st_nlink == 3  # the blob and two card paths
+
+        # one record reset: the other still links to the blob
+        asyncio.run(_merge(batch_id, [_changed(ROWS[0]), ROWS[1]]))
+        assert not cards["ana@example.com"].path.exists()
+        assert blob.stat().st_nlink == 2
+        assert card_store.collect_blobs(grace_seconds=0) == (0, 0)
+
+        # the last one reset: nothing links to it, so it goes
+        asyncio.run(_merge(batch_id, [_changed(ROWS[1])]))
+        assert not cards["luis@example.com"].path.exists()
+        assert blob.stat().st_nlink == 1
+        assert card_store.collect_blobs(grace_seconds=0) == (1, len(b"\x89PNG shared card"))
+        assert not blob.exists()
+    finally:
+        asyncio.run(_drop(batch_id))
+
+
+def test_unchanged_record_keeps_its_card():
+    batch_id, cards = asyncio.run(_batch_with_cards(b"\x89PNG kept card"))
+    try:
+        asyncio.run(_merge(batch_id, list(ROWS)))
+        assert all(card.path.exists() for card in cards.values())
+        assert card_store.collect_blobs(grace_seconds=0) == (0, 0)
+    finally:
+        asyncio.run(_drop(batch_id))
+
+
+def test_failed_ingest_drops_cards_of_its_committed_rows():
+    async def _run() -> tuple[uuid.UUID, card_store.StoredCard]:
+        async with WorkerSessionLocal() as db:
+            batch = Batch(status=BatchStatus.processing, original_filename="t.csv")
+            db.add(batch)
+            await db.commit()
+        stored = []
+
+        async def _records():
+            for i in range(BATCH_SIZE):
+                yield (f"Persona {i}", f"p{i}@example.com", None, "Analista", None)
+            # the first chunk is committed by now: a card arrives for one of its rows…
+            async with WorkerSessionLocal() as other:
+                rec_id = await other.scalar(
+                    CollabCard.__table__.select()
+                    .with_only_columns(CollabCard.__table__.c.id)
+                    .where(CollabCard.batch_id == batch.id)
+                    .limit(1)
+                )
+                card = card_store.store_card_bytes(
+                    b"\x89PNG early card", card_store.card_dest_dir(batch) / f"{rec_id}.png"
+                )
+                await card_store.attach_cards(other, batch, {rec_id: card})
+                await other.commit()
+                stored.append(card)
+            raise ValueError("…and then the file turns out to be broken")
+
+        async with WorkerSessionLocal() as db:
+            batch = await db.get(Batch, batch.id)
+            with pytest.raises(ValueError):
+                await ingest_into_batch(db, batch, _records())
+        return batch.id, stored[0]
+
+    batch_id, card = asyncio.run(_run())
+    try:
+        assert not card.path.exists()
+        assert card_store.collect_blobs(grace_seconds=0)[0] == 1
+    finally:
+        asyncio.run(_drop(batch_id))
@@ -0,0 +1,62 @@
+# backend/tests/test_csv_ingest.py
+"""
+``aiter_csv_rows`` against ``csv.reader`` over the whole text: the streamed
+parser must give the same rows whatever the chunk boundaries.
+
+Each body is longer than ``CSV_SNIFF_BYTES`` so that the chunked part of the
+parser (not only the sniffed sample) sees the awkward bytes, and the awkward
+bytes repeat often enough that every chunk size splits them somewhere.
+
+    cd backend
+    python -m pytest tests/test_csv_ingest.py
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+
+import pytest
+
+from app.services.ingest import CSV_SNIFF_BYTES, aiter_csv_rows
+
+HEADER = "Nombre,Correo,Puesto\r\n"
+
+BODIES = {
+    "crlf": "Ana Pérez,ana@example.com,Analista\r\n",
+    "quoted newlines": 'Luis Mora,luis@example.com,"Jefe\r\nde área"\r\n'
+    '"Eva\nRuiz",eva@example.com,"dice ""hola"",\nadiós"\n',
+    "bare cr": "Olga Díaz,olga@example.com,Gerente\r",
+    "multibyte": "Zoë Ñúñez,zoe@example.com,Diseñadora 📇 ✓\n",
+}
+
+CHUNK_SIZES = (1, 2, 3, 5, 7, 4096, CSV_SNIFF_BYTES + 1)
+
+
+def _text(row: str) -> str:
+    repeat = CSV_SNIFF_BYTES // len(row.encode()) * 2
+    return HEADER + row * repeat
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def _rows(data: bytes, size: int) -> list[list[str]]:
+    return [row async for row in aiter_csv_rows(_chunks(data, size))]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+@pytest.mark.parametrize("case", sorted(BODIES))
+def test_rows_match_csv_reader(case, size):
+    text = _text(BODIES[case])
+    expected = list(csv.reader(io.StringIO(text, newline="")))
+    assert asyncio.run(_rows(text.encode(), size)) == expected
+
+
+@pytest.mark.parametrize("size", (1, 3, 4096))
+def test_missing_final_newline(size):
+    text = _text(BODIES["multibyte"]).rstrip("\n")
+    expected = list(csv.reader(io.StringIO(text, newline="")))
+    assert asyncio.run(_rows(text.encode(), size)) == expected
@@ -0,0 +1,56 @@
+# backend/tests/test_query_plans.py
+"""
+The plan check of ``benchmarks/check_query_plans.py`` as a test. Opt-in:
+it needs PostgreSQL migrated to head, and is skipped otherwise.
+
+    cd backend
+    DATABASE_URL=postgresql+asyncpg://... SECRET_KEY=... python -m pytest tests/test_query_plans.py
+
+Seeds its own throw-away rows and removes them again.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+
+if not os.environ.get("DATABASE_URL", "").startswith("postgresql"):
+    pytest.skip("needs DATABASE_URL pointing at PostgreSQL", allow_module_level=True)
+
+from app.core.database import engine  # noqa: E402
+from benchmarks import check_query_plans  # noqa: E402
+
+# the index each query is meant to use
+EXPECTED_INDEXES = {
+    "records page": "ix_collabcards_batch_id_created_at_id",
+    "records keyset page": "ix_collabcards_batch_id_created_at_id",
+    "pending batches": "ix_batches_in_flight",
+    "render claim": "ix_collabcards_batch_id_unfinished",
+    "optimized blobs": "ix_collabcards_card_sha256",
+    "company users": "ix_users_company_id",
+}
+
+
+async def _explain() -> dict[str, check_query_plans.PlanResult]:
+    await check_query_plans._cleanup()
+    try:
+        await check_query_plans._seed(companies=10, batches=20, records=20_000)
+        return await check_query_plans.explain_queries()
+    finally:
+        await check_query_plans._cleanup()
+        await engine.dispose()  # its connections belong to this event loop
+
+
+@pytest.fixture(scope="module")
+def plans() -> dict[str, check_query_plans.PlanResult]:
+    return asyncio.run(_explain())
+
+
+def test_no_query_needs_a_seq_scan(plans):
+    assert {label: r.unindexed for label, r in plans.items() if r.unindexed} == {}
+
+
+@pytest.mark.parametrize("label", sorted(EXPECTED_INDEXES))
+def test_query_uses_its_index(plans, label):
+    assert EXPECTED_INDEXES[label] in plans[label].indexes
@@ -0,0 +1,126 @@
+# backend/tests/test_sheet_ingest.py
+"""
+Multi-sheet XLSX ingest: sheets parsed one per ``cards.parse_sheet`` task
+and read back by ``iter_saved_sheets`` must give what the in-process
+``iter_workbook_records`` gives.
+
+The last test drives the chord itself (Celery in eager mode) against the
+database and is skipped unless DATABASE_URL names one migrated to head:
+
+    cd backend
+    DATABASE_URL=... SECRET_KEY=... python -m pytest tests/test_sheet_ingest.py
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+
+import pytest
+from openpyxl import Workbook
+
+from app.services.ingest import (
+    ALL_SHEETS,
+    iter_saved_sheets,
+    iter_workbook_records,
+    save_sheet,
+    sheet_names,
+)
+from app.services.rejections import RejectionLog
+
+HEADER = ("Nombre", "Correo Electrónico", "Puesto", "Celular")
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    wb = Workbook()
+    wb.active.title = "Ventas"
+    wb["Ventas"].append(HEADER)
+    for i in range(30):
+        wb["Ventas"].append((f"Ana {i}", f"ana{i}@example.com", "Analista", f"8888-{i:04}"))
+    wb["Ventas"].append(("Sin Correo", None, "Gerente", None))  # rejected
+    wb.create_sheet("Notas").append(("solo una nota",))
+    wb.create_sheet("Soporte").append(HEADER)
+    for i in range(20):
+        wb["Soporte"].append((f"Luis {i}", f"luis{i}@example.com", "Técnico", None))
+    path = tmp_path / "upload.xlsx"
+    wb.save(path)
+    return path
+
+
+def _saved(path, sheets):
+    names, strict = sheet_names(path, sheets)
+    saved = [f"{path}.sheet{ix}" for ix in range(len(names))]
+    for name, out in zip(names, saved):
+        save_sheet(str(path), name, strict, out)
+    return names, saved
+
+
+def test_saved_sheets_match_workbook_records(workbook):
+    expected_rejections = RejectionLog()
+    expected = list(iter_workbook_records(workbook, [ALL_SHEETS], expected_rejections))
+
+    rejections = RejectionLog()
+    names, saved = _saved(workbook, [ALL_SHEETS])
+    assert list(iter_saved_sheets(names, saved, rejections)) == expected
+
+    assert len(expected) == 50
+    assert rejections.sheets == expected_rejections.sheets == ["Ventas", "Notas", "Soporte"]
+    assert rejections.columns() == expected_rejections.columns()
+    assert len(rejections) == 1
+    assert not list(workbook.parent.glob("*.sheet*"))
+
+
+def test_saved_sheet_error_is_raised_and_files_removed(workbook):
+    names, saved = _saved(workbook, ["Ventas", "Notas", "Soporte"])
+    with pytest.raises(ValueError, match="Notas"):
+        list(iter_saved_sheets(names, saved))
+    assert not list(workbook.parent.glob("*.sheet*"))
+
+
+@pytest.mark.skipif(not os.environ.get("DATABASE_URL"), reason="needs DATABASE_URL")
+def test_ingest_xlsx_parses_sheets_in_a_chord(workbook, monkeypatch):
+    from sqlalchemy import delete, func, select
+
+    from app.core.database import WorkerSessionLocal
+    from app.models import Batch, CollabCard
+    from app.models.enums import BatchStatus
+    from app.services import tasks
+
+    parsed = []
+
+    def _save_sheet(path, sheet, strict, out):
+        parsed.append(sheet)
+        save_sheet(path, sheet, strict, out)
+
+    monkeypatch.setattr(tasks, "save_sheet", _save_sheet)
+    monkeypatch.setattr(tasks.celery.conf, "task_always_eager", True)
+
+    batch_id = uuid.uuid4()
+
+    async def _create() -> None:
+        async with WorkerSessionLocal() as db:
+            db.add(Batch(id=batch_id, status=BatchStatus.processing, original_filename="t.xlsx"))
+            await db.commit()
+
+    async def _result() -> tuple[Batch, int]:
+        async with WorkerSessionLocal() as db:
+            batch = await db.get(Batch, batch_id)
+            count = await db.scalar(
+                select(func.count()).select_from(CollabCard).where(CollabCard.batch_id == batch_id)
+            )
+            await db.execute(delete(CollabCard).where(CollabCard.batch_id == batch_id))
+            await db.delete(batch)
+            await db.commit()
+            return batch, count
+
+    asyncio.run(_create())
+    assert tasks.ingest_xlsx(str(batch_id), str(workbook), [ALL_SHEETS]) is None
+    batch, count = asyncio.run(_result())
+
+    assert parsed == ["Ventas", "Notas", "Soporte"]
+    assert count == batch.total_records == 50
+    assert batch.rejected_records == 1
+    assert batch.status == BatchStatus.pending
+    assert not list(workbook.parent.glob("*.sheet*"))
+
@@ -1,11 +1,13 @@
 "use client";
 
 import { useParams } from "next/navigation";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery, useQuery } from "@tanstack/react-query";
 import { useAuth } from "@/lib/auth";
 import api from "@/lib/api";
 import { DataGrid } from "@/lib/tables";
-import { CollabCard } from "@/types/backend";
+import { Button } from "@/components/ui/button";
+import { BatchSummary, CollabCard } from "@/types/backend";
+import type { ScopedToken } from "@/types/auth";
 import { Row } from "@tanstack/react-table";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || "";
@@ -14,20 +16,53 @@ export default function CollabCardsPage() {
   const { id } = useParams();
   const { user } = useAuth();
 
-  const { data: cards = [], isLoading, isError } = useQuery({
-    queryKey: ["collabCards", id],
-    queryFn: async () => {
-      if (!id) return [];
-      const { data } = await api.get<CollabCard[]>(
-        `/collabcards/batch/${id}/records`,
-        {
+  // one page per request; X-Next-Cursor says where the next one starts
+  const { data, isLoading, isError, hasNextPage, fetchNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      queryKey: ["collabCards", id],
+      enabled: !!id,
+      initialPageParam: null as string | null,
+      queryFn: async ({ pageParam }) => {
+        const res = await api.get<CollabCard[]>(`/collabcards/batch/${id}/records`, {
+          params: pageParam ? { cursor: pageParam } : {},
           // if your endpoint needs company scoping, uncomment:
           // params: user?.company_id ? { company_id: user.company_id } : {}
-        }
-      );
-      return data;
-    },
+        });
+        return {
+          records: res.data,
+          next: (res.headers["x-next-cursor"] as string | undefined) ?? null,
+        };
+      },
+      getNextPageParam: (last) => last.next,
+    });
+  const cards = data?.pages.flatMap((p) => p.records) ?? [];
+
+  // counts per status without the records; polled until the batch is done
+  const { data: summary } = useQuery({
+    queryKey: ["batchSummary", id],
+    enabled: !!id,
+    queryFn: async () =>
+      (await api.get<BatchSummary>(`/collabcards/batch/${id}/summary`)).data,
+    refetchInterval: (query) =>
+      query.state.data?.status === "completed" ? false : 5_000,
+  });
+
+  // <img> can't send the Authorization header: a short-lived token that
+  // only opens this batch's cards goes in the URL instead (never the session's)
+  const { data: cardToken } = useQuery({
+    queryKey: ["cardToken", id],
+    enabled: !!id,
+    queryFn: async () =>
+      (await api.post<ScopedToken>(`/cards/batch/${id}/token`)).data.access_token,
+    staleTime: 10 * 60_000,
+    refetchInterval: 10 * 60_000, // tokens live at least 15 min
   });
+  const cardSrc = (url: string) =>
+    `${API_BASE}${url}${cardToken ? `&access_token=${encodeURIComponent(cardToken)}` : ""}`;
+  // the archive is a plain link too (Content-Disposition: attachment)
+  const archiveHref = cardToken
+    ? `${API_BASE}/cards/batch/${id}/archive?access_token=${encodeURIComponent(cardToken)}`
+    : undefined;
 
   if (isLoading) return <div>Loading…</div>;
   if (isError) return <div>Error loading cards</div>;
@@ -35,6 +70,20 @@ export default function CollabCardsPage() {
   return (
     <section className="space-y-8">
       <h2 className="text-2xl font-semibold">Cards for batch {id}</h2>
+      {summary && (
+        <p className="text-sm text-muted">
+          {summary.counts.generated} / {summary.total_records} generated
+          {" · "}{summary.counts.pending} pending
+          {" · "}{summary.counts.generating} generating
+          {" · "}{summary.counts.failed} failed
+          {" · "}{(summary.card_bytes / 1_048_576).toFixed(1)} MiB of cards
+        </p>
+      )}
+      {archiveHref && !!summary?.counts.generated && (
+        <Button href={archiveHref} variant="secondary" size="sm">
+          Download all cards (.zip)
+        </Button>
+      )}
       <DataGrid<CollabCard>
         data={cards}
         columns={[
@@ -47,21 +96,38 @@ export default function CollabCardsPage() {
           {
             header: "Card Image",
             cell: ({ row }: { row: Row<CollabCard> }) => {
-              const fn = row.original.card_filename;
-              if (!fn) return <span className="text-sm text-muted">–</span>;
-              // full URL to your cards endpoint
-              const src = `${API_BASE}/cards/${fn}`;
+              const { card_url, thumbnail_url } = row.original;
+              if (!card_url) return <span className="text-sm text-muted">–</span>;
+              const src = cardSrc(card_url);
+              const thumbSrc = thumbnail_url ? cardSrc(thumbnail_url) : src;
               return (
-                <img
-                  src={src}
-                  alt={row.original.full_name}
-                  className="h-24 w-auto rounded shadow-sm"
-                />
+                <a href={src} target="_blank" rel="noreferrer">
+                  <img
+                    src={thumbSrc}
+                    alt={row.original.full_name}
+                    loading="lazy"
+                    className="h-24 w-auto rounded shadow-sm"
+                    onError={(e) => {
+                      // preview not generated yet → fall back to the full card
+                      if (e.currentTarget.src !== src) e.currentTarget.src = src;
+                    }}
+                  />
+                </a>
               );
             },
           },
         ]}
       />
+      {hasNextPage && (
+        <Button
+          variant="secondary"
+          size="md"
+          onClick={() => fetchNextPage()}
+          disabled={isFetchingNextPage}
+        >
+          {isFetchingNextPage ? "Loading…" : "Load more"}
+        </Button>
+      )}
     </section>
   );
 }
@@ -5,6 +5,7 @@ import { useState } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { useAuth } from "@/lib/auth";
 import api from "@/lib/api";
+import { useBatchEvents } from "@/lib/events";
 import { DataGrid } from "@/lib/tables";
 import { Button } from "@/components/ui/button";
 import FileDrop from "@/components/ui/FileDrop";
@@ -61,6 +62,25 @@ export default function BatchesPage() {
       (!showCompanySelect || Boolean(companyId)),
   });
 
+  //
+  // 2️⃣b Live progress: merge pushed batch events into the list above
+  //     (same rule as the endpoint: in flight while ingesting or processed < total)
+  //
+  const watchedCompany = showCompanySelect ? companyId : user?.company_id;
+  useBatchEvents(watchedCompany, (batch) =>
+    qc.setQueryData<Batch[]>(["pendingBatches", watchedCompany], (list = []) => {
+      const rest = list.filter((b) => b.id !== batch.id);
+      const inFlight =
+        batch.status === "processing" ||
+        batch.processed_records < batch.total_records;
+      return inFlight
+        ? [batch, ...rest].sort((a, b) =>
+            (b.created_at ?? "").localeCompare(a.created_at ?? ""),
+          )
+        : rest;
+    }),
+  );
+
   //
   // 3️⃣ Upload mutation
   //
@@ -0,0 +1,65 @@
+// lib/events.ts – live batch progress from GET /collabcards/events (SSE).
+import { useEffect, useRef } from "react";
+import api from "./api";
+import type { ScopedToken } from "@/types/auth";
+import type { Batch } from "@/types/backend";
+
+/** A `batch` event: BatchRead fields plus the company and version. */
+export type BatchEvent = Batch & { company_id: string | null; updated_at: string };
+
+/**
+ * Call `onBatch` for every progress event of `companyId`'s batches.
+ * The stream opens with the in-flight batches, then pushes changes;
+ * EventSource reconnects by itself. EventSource can't send headers, so
+ * the URL carries a short-lived token scoped to this stream; once the
+ * server refuses it (expired), the stream is reopened with a fresh one.
+ */
+export function useBatchEvents(
+  companyId: string | null | undefined,
+  onBatch: (batch: BatchEvent) => void,
+) {
+  const handler = useRef(onBatch);
+  handler.current = onBatch;
+
+  useEffect(() => {
+    if (!companyId) return;
+    let source: EventSource | null = null;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let closed = false;
+
+    const open = async () => {
+      const params = new URLSearchParams({ company_id: companyId });
+      try {
+        const { data } = await api.post<ScopedToken>("/collabcards/events/token", null, {
+          params: { company_id: companyId },
+        });
+        params.set("access_token", data.access_token);
+      } catch {
+        if (!closed) retry = setTimeout(open, 5_000);
+        return;
+      }
+      if (closed) return;
+
+      source = new EventSource(
+        `${api.defaults.baseURL ?? ""}/collabcards/events?${params}`,
+      );
+      source.addEventListener("batch", (e) =>
+        handler.current(JSON.parse((e as MessageEvent<string>).data)),
+      );
+      source.onerror = () => {
+        // CLOSED: the server answered with an error (e.g. 401), no auto-retry
+        if (source?.readyState === EventSource.CLOSED && !closed) {
+          source.close();
+          retry = setTimeout(open, 1_000);
+        }
+      };
+    };
+    open();
+
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      source?.close();
+    };
+  }, [companyId]);
+}
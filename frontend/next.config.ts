@@ -9,7 +9,7 @@ const nextConfig: NextConfig = {
         protocol: "http",
         hostname: "backend",
         port: "8000",
-        pathname: "/static/cards/**",
+        pathname: "/api/cards/**",
       },
     ],
   },
@@ -2,4 +2,9 @@
 export interface Token {
     access_token: string;
     token_type: string;
-  }
\ No newline at end of file
+  }
+
+/** `?access_token=` for one batch's cards or one company's events. */
+export interface ScopedToken extends Token {
+    expires_at: string;
+  }
@@ -34,6 +34,7 @@ export interface Batch {
 
   total_records: number;
   processed_records: number;
+  rejected_records?: number;
   status: BatchStatus;
 
   created_at?: string; // ISO-8601
@@ -42,6 +43,18 @@ export interface Batch {
   records?: unknown[];
 }
 
+/** GET /collabcards/batch/{id}/summary – mirrors app.schemas.batch.BatchSummary */
+export interface BatchSummary {
+  batch_id: string;
+  status: BatchStatus;
+  total_records: number;
+  processed_records: number;
+  counts: Record<CollabCardStatus, number>;
+  card_bytes: number;       // generated cards measured so far
+  unmeasured_cards: number; // generated, not sized by the optimize stage yet
+  updated_at: string;
+}
+
 /**
  * The record_status Postgres enum is exposed as plain strings.
  * Keep in sync with `app/models/enums.py::RecordStatus`.
@@ -64,6 +77,13 @@ export interface CollabCard {
   status: CollabCardStatus;
   card_filename?: string | null;
   generated_at?: string | null;
+  card_sha256?: string | null;
+  card_bytes_original?: number | null;
+  card_bytes?: number | null;
+  /** full card, relative to the API root (long-cached) */
+  card_url?: string | null;
+  /** small WebP preview, relative to the API root (long-cached) */
+  thumbnail_url?: string | null;
 }
 
 // types/backend.ts